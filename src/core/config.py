@@ -28,6 +28,7 @@ class EmailConfig(BaseModel):
     use_tls: bool = Field(default=True)
     username: str = Field(default="")
     password: str = Field(default="")
+    max_connections: int = Field(default=2)
     
 class AIConfig(BaseModel):
     """AI assistant configuration"""
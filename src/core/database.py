@@ -11,7 +11,7 @@ from datetime import datetime
 from typing import Optional, List, Dict, Any
 from pathlib import Path
 
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Float, Boolean, Text, ForeignKey
+from sqlalchemy import create_engine, event, func, select, bindparam, Column, Integer, String, DateTime, Float, Boolean, Text, ForeignKey
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship, Session
 from sqlalchemy.pool import StaticPool
@@ -111,6 +111,9 @@ class UserSettings(Base):
     data_type = Column(String(20), default='string')  # string, int, float, bool, json
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+# Built once; SQLAlchemy reuses the compiled form for every lookup
+_CARDHOLDER_BY_CARD_NUMBER = select(Cardholder).where(Cardholder.card_number == bindparam('card_number'))
+
 class DatabaseManager:
     """Database management class"""
     
@@ -119,6 +122,9 @@ class DatabaseManager:
         self.engine = None
         self.SessionLocal = None
         
+        # Bumped on every committed transaction; lets callers cache derived data
+        self.version = 0
+        
         # Create data directory if using SQLite
         if database_url.startswith("sqlite"):
             db_path = database_url.replace("sqlite:///", "")
@@ -128,15 +134,22 @@ class DatabaseManager:
     
     def _initialize(self):
         """Initialize database connection and tables"""
-        # Create engine with connection pooling for SQLite
+        # SQLite: one connection per checkout so UI, I/O pool, email and script
+        # threads never share a transaction; WAL lets readers run beside a writer
         if self.database_url.startswith("sqlite"):
-            self.engine = create_engine(
-                self.database_url,
-                poolclass=StaticPool,
-                connect_args={"check_same_thread": False, "timeout": 20}
-            )
+            connect_args = {"check_same_thread": False, "timeout": 20}
+            if self._is_memory_sqlite():
+                # Every connection to :memory: is a separate database; tests only
+                self.engine = create_engine(self.database_url, poolclass=StaticPool,
+                                            connect_args=connect_args)
+            else:
+                self.engine = create_engine(self.database_url, connect_args=connect_args)
+                event.listen(self.engine, "connect", self._set_sqlite_pragmas)
         else:
-            self.engine = create_engine(self.database_url)
+            # Pooled connections can go stale on server databases
+            self.engine = create_engine(self.database_url, pool_pre_ping=True)
+        
+        event.listen(self.engine, "commit", self._bump_version)
         
         # Create session factory
         self.SessionLocal = sessionmaker(
@@ -148,6 +161,23 @@ class DatabaseManager:
         # Create tables
         Base.metadata.create_all(bind=self.engine)
     
+    def _is_memory_sqlite(self) -> bool:
+        """True for an in-memory SQLite URL"""
+        path = self.database_url.partition("///")[2]
+        return path in ("", ":memory:") or "mode=memory" in path
+    
+    @staticmethod
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """Engine connect hook: WAL journal for concurrent readers"""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+    
+    def _bump_version(self, connection):
+        """Engine commit hook"""
+        self.version += 1
+    
     def get_session(self) -> Session:
         """Get database session"""
         return self.SessionLocal()
@@ -182,14 +212,55 @@ class DatabaseManager:
             query = session.query(Cardholder)
             if active_only:
                 query = query.filter(Cardholder.active == True)
-            return query.all()
+            return query.order_by(Cardholder.id).all()
+    
+    def get_cardholders_page(self, offset: int, limit: int,
+                             active_only: bool = True) -> List[Cardholder]:
+        """Get one page of cardholders in the same order as get_cardholders"""
+        with self.get_session() as session:
+            query = session.query(Cardholder)
+            if active_only:
+                query = query.filter(Cardholder.active == True)
+            return query.order_by(Cardholder.id).offset(offset).limit(limit).all()
+    
+    def count_cardholders(self, active_only: bool = True) -> int:
+        """Count cardholders without loading them"""
+        with self.get_session() as session:
+            query = session.query(func.count(Cardholder.id))
+            if active_only:
+                query = query.filter(Cardholder.active == True)
+            return query.scalar() or 0
     
     def get_cardholder_by_card_number(self, card_number: str) -> Optional[Cardholder]:
         """Get cardholder by card number"""
         with self.get_session() as session:
-            return session.query(Cardholder).filter(
-                Cardholder.card_number == card_number
-            ).first()
+            return session.execute(
+                _CARDHOLDER_BY_CARD_NUMBER, {'card_number': card_number}
+            ).scalar_one_or_none()
+    
+    def update_cardholder(self, cardholder_id: int, **fields) -> Optional[Cardholder]:
+        """Update cardholder fields by id; returns None if not found"""
+        with self.get_session() as session:
+            cardholder = session.get(Cardholder, cardholder_id)
+            if not cardholder:
+                return None
+            for key, value in fields.items():
+                setattr(cardholder, key, value)
+            session.commit()
+            session.refresh(cardholder)
+            return cardholder
+    
+    def delete_cardholder(self, card_number: str) -> bool:
+        """Delete cardholder by card number; returns False if not found"""
+        with self.get_session() as session:
+            cardholder = session.execute(
+                _CARDHOLDER_BY_CARD_NUMBER, {'card_number': card_number}
+            ).scalar_one_or_none()
+            if not cardholder:
+                return False
+            session.delete(cardholder)
+            session.commit()
+            return True
     
     # Transaction methods
     def create_transaction(self, cardholder_id: int, transaction_date: datetime,
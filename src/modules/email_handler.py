@@ -8,7 +8,9 @@ Outlook/Teams integration.
 
 import os
 import re
+import json
 import smtplib
+import time
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple
 from email.mime.text import MIMEText
@@ -17,8 +19,10 @@ from email.mime.base import MIMEBase
 from email import encoders
 from datetime import datetime, timedelta
 import uuid
+from collections import defaultdict
 
 try:
+    import pythoncom
     import win32com.client as win32
     WIN32_AVAILABLE = True
 except ImportError:
@@ -42,6 +46,9 @@ class EmailTemplate:
 class EmailRecipient:
     """Email recipient information"""
     
+    # Bulk sends create one per address; no per-instance __dict__
+    __slots__ = ("email", "name", "variables")
+    
     def __init__(self, email: str, name: str = "", variables: Dict[str, str] = None):
         self.email = email
         self.name = name
@@ -66,6 +73,11 @@ class EmailJob:
 class EmailHandler:
     """Advanced email processing handler"""
     
+    # Most servers cap RCPT TO per transaction at 100
+    MAX_RECIPIENTS_PER_ENVELOPE = 100
+    # Failures tolerated before a bulk job aborts, however small the job
+    MIN_ABORT_FAILURES = 10
+    
     def __init__(self, config: DashboardConfig):
         self.config = config
         self.db_manager = get_db_manager(config.database.url)
@@ -150,7 +162,6 @@ Administration Team""",
         """Save template to file"""
         template_path = self.template_dir / f"{template.name}.json"
         
-        import json
         template_data = {
             'name': template.name,
             'subject': template.subject,
@@ -170,7 +181,6 @@ Administration Team""",
         # Try to load from file
         template_path = self.template_dir / f"{name}.json"
         if template_path.exists():
-            import json
             with open(template_path, 'r', encoding='utf-8') as f:
                 data = json.load(f)
             
@@ -187,12 +197,29 @@ Administration Team""",
     
     def list_templates(self) -> List[str]:
         """Get list of available templates"""
-        return list(self.templates.keys())
+        names = list(self.templates.keys())
+        
+        # Saved templates are listed by file name; they are only parsed on load
+        try:
+            with os.scandir(self.template_dir) as entries:
+                saved = sorted(
+                    entry.name[:-len('.json')] for entry in entries
+                    if entry.name.endswith('.json') and entry.is_file()
+                )
+        except OSError as e:
+            logger.warning(f"Failed to list saved templates: {e}")
+            saved = []
+        
+        known = set(names)
+        names.extend(name for name in saved if name not in known)
+        return names
     
     def create_bulk_job(self, template_name: str, recipients: List[EmailRecipient],
-                       attachments: List[str] = None, priority: str = "normal") -> str:
-        """Create a bulk email job"""
-        template = self.load_template(template_name)
+                       attachments: List[str] = None, priority: str = "normal",
+                       template: Optional[EmailTemplate] = None) -> str:
+        """Create a bulk email job; an explicit template is used instead of looking one up"""
+        if template is None:
+            template = self.load_template(template_name)
         if not template:
             raise ValueError(f"Template '{template_name}' not found")
         
@@ -288,50 +315,65 @@ Administration Team""",
             
             return False
     
+    def _connect_smtp(self) -> smtplib.SMTP:
+        """Open an SMTP connection, upgraded to TLS and logged in as configured"""
+        server = smtplib.SMTP(self.config.email.smtp_server, self.config.email.smtp_port)
+        
+        if self.config.email.use_tls:
+            server.starttls()
+        
+        if self.config.email.username and self.config.email.password:
+            server.login(self.config.email.username, self.config.email.password)
+        
+        return server
+    
+    def _build_smtp_message(self, to_header: str, subject: str, body: str,
+                            attachments: List[str] = None, is_html: bool = False) -> MIMEMultipart:
+        """Build a MIME message with body and attachments"""
+        msg = MIMEMultipart()
+        msg['From'] = self.config.email.username
+        msg['To'] = to_header
+        msg['Subject'] = subject
+        
+        # Add body
+        if is_html:
+            msg.attach(MIMEText(body, 'html'))
+        else:
+            msg.attach(MIMEText(body, 'plain'))
+        
+        # Add attachments
+        if attachments:
+            for attachment_path in attachments:
+                if Path(attachment_path).exists():
+                    with open(attachment_path, "rb") as attachment:
+                        part = MIMEBase('application', 'octet-stream')
+                        part.set_payload(attachment.read())
+                    
+                    encoders.encode_base64(part)
+                    part.add_header(
+                        'Content-Disposition',
+                        f'attachment; filename= {Path(attachment_path).name}'
+                    )
+                    msg.attach(part)
+                else:
+                    logger.warning(f"Attachment not found: {attachment_path}")
+        
+        return msg
+    
     def send_via_smtp(self, to_email: str, subject: str, body: str,
-                     attachments: List[str] = None, is_html: bool = False) -> bool:
-        """Send email via SMTP"""
+                     attachments: List[str] = None, is_html: bool = False,
+                     server: Optional[smtplib.SMTP] = None) -> bool:
+        """Send email via SMTP, over server if given or a connection opened for this message"""
         try:
-            # Create message
-            msg = MIMEMultipart()
-            msg['From'] = self.config.email.username
-            msg['To'] = to_email
-            msg['Subject'] = subject
+            msg = self._build_smtp_message(to_email, subject, body, attachments, is_html)
             
-            # Add body
-            if is_html:
-                msg.attach(MIMEText(body, 'html'))
+            # Send on the caller's connection, or connect just for this message
+            if server is not None:
+                server.send_message(msg)
             else:
-                msg.attach(MIMEText(body, 'plain'))
-            
-            # Add attachments
-            if attachments:
-                for attachment_path in attachments:
-                    if Path(attachment_path).exists():
-                        with open(attachment_path, "rb") as attachment:
-                            part = MIMEBase('application', 'octet-stream')
-                            part.set_payload(attachment.read())
-                        
-                        encoders.encode_base64(part)
-                        part.add_header(
-                            'Content-Disposition',
-                            f'attachment; filename= {Path(attachment_path).name}'
-                        )
-                        msg.attach(part)
-                    else:
-                        logger.warning(f"Attachment not found: {attachment_path}")
-            
-            # Connect to server and send
-            server = smtplib.SMTP(self.config.email.smtp_server, self.config.email.smtp_port)
-            
-            if self.config.email.use_tls:
-                server.starttls()
-            
-            if self.config.email.username and self.config.email.password:
-                server.login(self.config.email.username, self.config.email.password)
-            
-            server.send_message(msg)
-            server.quit()
+                own_server = self._connect_smtp()
+                own_server.send_message(msg)
+                own_server.quit()
             
             # Log success
             self.db_manager.log_email(
@@ -346,6 +388,10 @@ Administration Team""",
             return True
             
         except Exception as e:
+            # A dropped shared connection is retried by the caller, not logged as a failure
+            if server is not None and isinstance(e, smtplib.SMTPServerDisconnected):
+                raise
+            
             logger.error(f"Failed to send email via SMTP to {to_email}", exception=e)
             
             # Log failure
@@ -360,6 +406,103 @@ Administration Team""",
             
             return False
     
+    def send_group_via_smtp(self, to_emails: List[str], subject: str, body: str,
+                           attachments: List[str] = None, is_html: bool = False,
+                           server: Optional[smtplib.SMTP] = None) -> Dict[str, bool]:
+        """Send one message to several addresses in a single envelope; returns success per address"""
+        body_preview = body[:200] + "..." if len(body) > 200 else body
+        errors: Dict[str, str] = {}
+        
+        try:
+            # Addresses go in the envelope only, so recipients do not see each other
+            msg = self._build_smtp_message("undisclosed-recipients:;", subject, body,
+                                           attachments, is_html)
+            
+            if server is not None:
+                refused = server.send_message(msg, to_addrs=to_emails)
+            else:
+                own_server = self._connect_smtp()
+                refused = own_server.send_message(msg, to_addrs=to_emails)
+                own_server.quit()
+            errors = {email: str(reason) for email, reason in refused.items()}
+            
+        except smtplib.SMTPRecipientsRefused as e:
+            errors = {email: str(reason) for email, reason in e.recipients.items()}
+        except Exception as e:
+            if server is not None and isinstance(e, smtplib.SMTPServerDisconnected):
+                raise
+            
+            # The shared message was rejected as a whole; one bad address or a
+            # recipient limit must not fail the group, so send to each in turn
+            logger.warning(f"Group send to {len(to_emails)} recipients failed, sending individually: {e}")
+            return {email: self.send_via_smtp(email, subject, body, attachments, is_html, server=server)
+                    for email in to_emails}
+        
+        for email in to_emails:
+            self.db_manager.log_email(
+                recipient_email=email,
+                subject=subject,
+                body_preview=body_preview,
+                status="failed" if email in errors else "sent",
+                error_message=errors.get(email),
+                attachments_count=len(attachments) if attachments else 0
+            )
+        
+        sent = len(to_emails) - len(errors)
+        logger.info(f"Email sent via SMTP to {sent} of {len(to_emails)} recipients in one envelope")
+        return {email: email not in errors for email in to_emails}
+    
+    def _group_recipients(self, recipients: List[EmailRecipient]) -> List[List[EmailRecipient]]:
+        """Group recipients that receive an identical message by domain, one envelope each"""
+        groups: List[List[EmailRecipient]] = []
+        by_domain: Dict[str, List[EmailRecipient]] = defaultdict(list)
+        
+        for recipient in recipients:
+            # Personalised messages differ per recipient and go on their own
+            if recipient.variables:
+                groups.append([recipient])
+            else:
+                by_domain[recipient.email.rsplit('@', 1)[-1].lower()].append(recipient)
+        
+        size = self.MAX_RECIPIENTS_PER_ENVELOPE
+        for domain_recipients in by_domain.values():
+            groups.extend(domain_recipients[i:i + size]
+                          for i in range(0, len(domain_recipients), size))
+        return groups
+    
+    def _send_smtp_group(self, group: List[EmailRecipient], subject: str, body: str,
+                         attachments: List[str], server: smtplib.SMTP) -> Dict[str, bool]:
+        """Send to a recipient group over server; a lone recipient keeps their own To header"""
+        if len(group) == 1:
+            email = group[0].email
+            return {email: self.send_via_smtp(email, subject, body, attachments, server=server)}
+        return self.send_group_via_smtp([r.email for r in group], subject, body,
+                                        attachments, server=server)
+    
+    def _skip_recipients(self, job: EmailJob, groups: List[List[EmailRecipient]]) -> int:
+        """Record recipients left unsent by an aborted job as failed; returns how many"""
+        timestamp = datetime.now()
+        skipped = 0
+        for group in groups:
+            subject = self.process_variables(job.template.subject, group[0].variables)
+            for recipient in group:
+                job.results.append({
+                    'recipient': recipient.email,
+                    'success': False,
+                    'skipped': True,
+                    'error': "Skipped: job aborted after too many failures",
+                    'timestamp': timestamp
+                })
+                self.db_manager.log_email(
+                    recipient_email=recipient.email,
+                    subject=subject,
+                    status="skipped",
+                    error_message="Job aborted after too many failures",
+                    attachments_count=len(job.attachments)
+                )
+                skipped += 1
+        return skipped
+    
     def execute_bulk_job(self, job_id: str, use_outlook: bool = True,
                         delay_seconds: float = 1.0) -> Dict[str, Any]:
         """Execute a bulk email job"""
@@ -377,61 +520,106 @@ Administration Team""",
         
         success_count = 0
         failed_count = 0
+        # Stop early rather than keep hammering a server that rejects most messages
+        max_failures = max(self.MIN_ABORT_FAILURES, len(job.recipients) // 3)
+        aborted = False
+        skipped_count = 0
+        
+        use_outlook = use_outlook and WIN32_AVAILABLE
+        smtp = None
         
         logger.info(f"Starting bulk email job {job_id} with {len(job.recipients)} recipients")
         
-        for i, recipient in enumerate(job.recipients):
-            try:
-                # Process template
-                subject = self.process_variables(job.template.subject, recipient.variables)
-                body = self.process_variables(job.template.body, recipient.variables)
-                
-                # Send email
-                if use_outlook and WIN32_AVAILABLE:
-                    success = self.send_via_outlook(
-                        recipient.email, subject, body, job.attachments
-                    )
-                else:
-                    success = self.send_via_smtp(
-                        recipient.email, subject, body, job.attachments
-                    )
-                
-                # Record result
-                job.results.append({
-                    'recipient': recipient.email,
-                    'success': success,
-                    'timestamp': datetime.now()
-                })
+        # Outlook automation needs COM initialised on the calling thread
+        if use_outlook:
+            pythoncom.CoInitialize()
+        # Over SMTP, identical messages to one domain share an envelope
+        if use_outlook:
+            groups = [[recipient] for recipient in job.recipients]
+        else:
+            groups = self._group_recipients(job.recipients)
+        
+        try:
+            for i, group in enumerate(groups):
+                try:
+                    # Process template; every recipient in a group has the same variables
+                    subject = self.process_variables(job.template.subject, group[0].variables)
+                    body = self.process_variables(job.template.body, group[0].variables)
+                    
+                    # Send email
+                    if use_outlook:
+                        outcomes = {group[0].email: self.send_via_outlook(
+                            group[0].email, subject, body, job.attachments
+                        )}
+                    else:
+                        # One SMTP session for the whole job; reopened if the server drops it
+                        if smtp is None:
+                            smtp = self._connect_smtp()
+                        try:
+                            outcomes = self._send_smtp_group(group, subject, body, job.attachments, smtp)
+                        except smtplib.SMTPServerDisconnected:
+                            smtp = self._connect_smtp()
+                            outcomes = self._send_smtp_group(group, subject, body, job.attachments, smtp)
+                    
+                    # Record results
+                    timestamp = datetime.now()
+                    for recipient in group:
+                        success = outcomes.get(recipient.email, False)
+                        job.results.append({
+                            'recipient': recipient.email,
+                            'success': success,
+                            'timestamp': timestamp
+                        })
+                        
+                        if success:
+                            success_count += 1
+                        else:
+                            failed_count += 1
+                    
+                except Exception as e:
+                    logger.error(f"Failed to send email to {', '.join(r.email for r in group)}", exception=e)
+                    failed_count += len(group)
+                    
+                    timestamp = datetime.now()
+                    job.results.extend({
+                        'recipient': recipient.email,
+                        'success': False,
+                        'error': str(e),
+                        'timestamp': timestamp
+                    } for recipient in group)
                 
-                if success:
-                    success_count += 1
-                else:
-                    failed_count += 1
+                if failed_count > max_failures:
+                    aborted = True
+                    logger.error(f"Aborting bulk email job {job_id} after {failed_count} failures")
+                    skipped_count = self._skip_recipients(job, groups[i + 1:])
+                    failed_count += skipped_count
+                    break
                 
                 # Add delay between emails
-                if delay_seconds > 0 and i < len(job.recipients) - 1:
-                    import time
+                if delay_seconds > 0 and i < len(groups) - 1:
                     time.sleep(delay_seconds)
-                
-            except Exception as e:
-                logger.error(f"Failed to send email to {recipient.email}", exception=e)
-                failed_count += 1
-                
-                job.results.append({
-                    'recipient': recipient.email,
-                    'success': False,
-                    'error': str(e),
-                    'timestamp': datetime.now()
-                })
+        finally:
+            if smtp is not None:
+                try:
+                    smtp.quit()
+                except (smtplib.SMTPException, OSError):
+                    pass
+            if use_outlook:
+                pythoncom.CoUninitialize()
         
         job.completed_at = datetime.now()
-        job.status = "completed" if failed_count == 0 else "partial"
+        if aborted:
+            job.status = "failed"
+        else:
+            job.status = "completed" if failed_count == 0 else "partial"
         
         results = {
             'job_id': job_id,
+            'status': job.status,
             'total_recipients': len(job.recipients),
             'success_count': success_count,
             'failed_count': failed_count,
+            'skipped_count': skipped_count,
             'duration_seconds': (job.completed_at - job.started_at).total_seconds(),
             'results': job.results
         }
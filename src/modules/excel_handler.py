@@ -12,6 +12,7 @@ from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 import hashlib
+import pickle
 
 import pandas as pd
 import numpy as np
@@ -23,9 +24,17 @@ import xlsxwriter
 from ..core.logger import logger
 from ..core.database import get_db_manager, Cardholder, Transaction
 
+# Read card numbers as text (keeps long numbers and leading zeros, skips dtype inference)
+CARD_NUMBER_DTYPES = {'Card Number': str, 'CardNumber': str}
+
 class ExcelHandler:
     """Advanced Excel processing handler"""
     
+    # Width of the cardholders.card_number column
+    CARD_NUMBER_MAX_LENGTH = 50
+    # Parsed sheets kept in the on-disk cache; least recently used go first
+    CACHE_MAX_ENTRIES = 20
+    
     def __init__(self, config):
         self.config = config
         self.db_manager = get_db_manager(config.database.url)
@@ -38,6 +47,8 @@ class ExcelHandler:
         # Cache for loaded files
         self._file_cache = {}
         self._last_modified = {}
+        self.cache_dir = self.temp_dir / "excel_cache"
+        self.cache_max_entries = self.CACHE_MAX_ENTRIES
         
         logger.info("Excel handler initialized")
     
@@ -162,6 +173,13 @@ class ExcelHandler:
             if sheet_name is None:
                 sheet_name = "OUTSTANDING LOGS"
             
+            # Reuse the cleaned frame from a previous parse of the same file
+            cache_path, signature = self._cardholder_cache_entry(file_path, sheet_name)
+            cached = self._read_cached_frame(cache_path, signature)
+            if cached is not None:
+                logger.info(f"Loaded {len(cached)} cardholder records from cache")
+                return self._add_load_timestamps(cached)
+            
             # Check if the sheet exists
             try:
                 excel_file = pd.ExcelFile(file_path)
@@ -180,24 +198,86 @@ class ExcelHandler:
                         sheet_name = available_sheets[0]
                         logger.info(f"Using first sheet '{sheet_name}' as fallback")
                 
-                # Read the Excel file
-                df = pd.read_excel(file_path, sheet_name=sheet_name)
+                # Parse from the workbook already opened above instead of reopening it
+                df = excel_file.parse(sheet_name, dtype=CARD_NUMBER_DTYPES)
                 
             except Exception as e:
                 logger.warning(f"Failed to read sheet '{sheet_name}': {e}")
                 # Try reading without specifying sheet name
-                df = pd.read_excel(file_path)
+                df = pd.read_excel(file_path, dtype=CARD_NUMBER_DTYPES)
             
             # Clean and standardize cardholder data
             df = self._clean_cardholder_data(df)
+            self._write_cached_frame(cache_path, signature, df)
             
             logger.info(f"Successfully loaded {len(df)} cardholder records from '{sheet_name}' sheet")
-            return df
+            return self._add_load_timestamps(df)
             
         except Exception as e:
             logger.error(f"Failed to load cardholder data from {file_path}", exception=e)
             raise
     
+    def _cardholder_cache_entry(self, file_path: Path, sheet_name: str) -> Tuple[Path, Tuple]:
+        """Return the on-disk cache path and change signature for a workbook sheet"""
+        resolved = file_path.resolve()
+        stat = resolved.stat()
+        digest = hashlib.sha1(f"{resolved}|{sheet_name}".encode('utf-8')).hexdigest()
+        return self.cache_dir / f"{digest}.pkl", (stat.st_mtime_ns, stat.st_size)
+    
+    def _read_cached_frame(self, cache_path: Path, signature: Tuple) -> Optional[pd.DataFrame]:
+        """Load a cached DataFrame if it was built from an unchanged file"""
+        try:
+            with open(cache_path, 'rb') as f:
+                cached_signature, df = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable Excel cache {cache_path.name}: {e}")
+            return None
+        if cached_signature != signature:
+            return None
+        
+        # Mark as recently used for eviction
+        try:
+            os.utime(cache_path)
+        except OSError:
+            pass
+        return df
+    
+    def _write_cached_frame(self, cache_path: Path, signature: Tuple, df: pd.DataFrame):
+        """Store a parsed DataFrame, replacing any entry for an older version of the file"""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix('.tmp')
+            with open(tmp_path, 'wb') as f:
+                pickle.dump((signature, df), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+            self._evict_cached_frames()
+        except Exception as e:
+            logger.warning(f"Failed to cache Excel data: {e}")
+    
+    def _evict_cached_frames(self):
+        """Drop the least recently used cache entries beyond cache_max_entries"""
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith('.pkl'):
+                try:
+                    entries.append((entry.stat().st_mtime_ns, entry.path))
+                except OSError:
+                    pass
+        
+        entries.sort(reverse=True)
+        for _, path in entries[self.cache_max_entries:]:
+            try:
+                os.remove(path)
+            except OSError as e:
+                logger.warning(f"Failed to evict Excel cache entry {path}: {e}")
+    
+    def _add_load_timestamps(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Stamp created_at/updated_at with the time of this load"""
+        now = datetime.now()
+        return df.assign(created_at=now, updated_at=now)
+    
     def _clean_cardholder_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """Clean and standardize cardholder data, handling OUTSTANDING LOGS sheet format"""
         
@@ -334,11 +414,9 @@ class ExcelHandler:
         if before_count != after_count:
             logger.info(f"Filtered out {before_count - after_count} incomplete records")
         
-        # Add timestamps
-        from datetime import datetime
-        now = datetime.now()
-        renamed_df['created_at'] = now
-        renamed_df['updated_at'] = now
+        # Departments and cost centres repeat across rows; store each distinct value once
+        for col in ('department', 'cost_centre'):
+            renamed_df[col] = renamed_df[col].astype('category')
         
         logger.info(f"Cleaned cardholder data: {len(renamed_df)} valid records")
         return renamed_df
@@ -697,39 +775,72 @@ class ExcelHandler:
         """Sync cardholder data with database"""
         logger.info(f"Syncing {len(df)} cardholders with database")
         
-        synced_count = 0
-        for _, row in df.iterrows():
-            try:
-                # Check if cardholder already exists
-                existing = None
-                if 'card_number' in row and pd.notna(row['card_number']):
-                    existing = self.db_manager.get_cardholder_by_card_number(str(row['card_number']))
-                
-                if existing:
-                    # Update existing cardholder
-                    with self.db_manager.get_session() as session:
-                        existing.name = str(row.get('name', existing.name))  # Use 'name' not 'FullName'
-                        existing.email = str(row.get('email', existing.email))
-                        existing.department = str(row.get('department', existing.department) if pd.notna(row.get('department')) else existing.department)
-                        existing.manager_email = str(row.get('manager_email', existing.manager_email) if pd.notna(row.get('manager_email')) else existing.manager_email)
-                        existing.cost_centre = str(row.get('cost_centre', existing.cost_centre) if pd.notna(row.get('cost_centre')) else existing.cost_centre)
-                        existing.updated_at = datetime.utcnow()
-                        session.commit()
-                else:
-                    # Create new cardholder
-                    self.db_manager.create_cardholder(
-                        card_number=str(row.get('card_number', f"TEMP_{synced_count}")),
-                        name=str(row.get('name', 'Unknown')),  # Use 'name' not 'FullName'
-                        email=str(row.get('email', '')),
-                        manager_email=str(row.get('manager_email', '') if pd.notna(row.get('manager_email')) else None),
-                        department=str(row.get('department', '') if pd.notna(row.get('department')) else None),
-                        cost_centre=str(row.get('cost_centre', '') if pd.notna(row.get('cost_centre')) else None)
-                    )
-                
-                synced_count += 1
-                
-            except Exception as e:
-                logger.warning(f"Failed to sync cardholder: {e}")
+        def optional(record, key):
+            value = record.get(key)
+            return str(value) if pd.notna(value) else None
+        
+        with self.db_manager.get_session() as session:
+            # One query for the ids of every card number already stored
+            existing = dict(session.query(Cardholder.card_number, Cardholder.id))
+            
+            inserts: Dict[str, Dict[str, Any]] = {}
+            updates: Dict[str, Dict[str, Any]] = {}
+            seen: Dict[str, int] = {}
+            now = datetime.utcnow()
+            synced_count = 0
+            
+            # Rows are validated one by one so a bad row is skipped, not the whole sheet
+            for row_number, record in enumerate(df.to_dict('records'), start=1):
+                try:
+                    card_number = (optional(record, 'card_number') or '').strip()
+                    if not card_number:
+                        logger.warning(f"Skipping cardholder row {row_number}: no card number")
+                        continue
+                    if len(card_number) > self.CARD_NUMBER_MAX_LENGTH:
+                        logger.warning(f"Skipping cardholder row {row_number}: invalid card number {card_number!r}")
+                        continue
+                    if card_number in seen:
+                        logger.warning(
+                            f"Skipping cardholder row {row_number}: card number {card_number} "
+                            f"duplicates row {seen[card_number]}"
+                        )
+                        continue
+                    
+                    if card_number in existing:
+                        # Update existing cardholder; missing optional fields keep their value
+                        mapping = {'id': existing[card_number], 'updated_at': now}
+                        if 'name' in record:
+                            mapping['name'] = str(record['name'])  # Use 'name' not 'FullName'
+                        if 'email' in record:
+                            mapping['email'] = str(record['email'])
+                        for key in ('department', 'manager_email', 'cost_centre'):
+                            value = optional(record, key)
+                            if value is not None:
+                                mapping[key] = value
+                        updates[card_number] = mapping
+                    else:
+                        # Create new cardholder
+                        inserts[card_number] = {
+                            'card_number': card_number,
+                            'name': str(record.get('name', 'Unknown')),  # Use 'name' not 'FullName'
+                            'email': str(record.get('email', '')),
+                            'manager_email': optional(record, 'manager_email'),
+                            'department': optional(record, 'department'),
+                            'cost_centre': optional(record, 'cost_centre'),
+                        }
+                    
+                    seen[card_number] = row_number
+                    synced_count += 1
+                    
+                except Exception as e:
+                    logger.warning(f"Failed to sync cardholder row {row_number}: {e}")
+            
+            # Two statements and one commit for the whole sheet
+            if inserts:
+                session.bulk_insert_mappings(Cardholder, list(inserts.values()))
+            if updates:
+                session.bulk_update_mappings(Cardholder, list(updates.values()))
+            session.commit()
         
         logger.info(f"Successfully synced {synced_count} cardholders")
 
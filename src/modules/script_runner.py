@@ -4,28 +4,36 @@ Script Runner Module
 
 Advanced script execution with monitoring, scheduling,
 and output streaming.
+
+Processes are launched so that CPython can use posix_spawn() instead of
+fork()+exec() on POSIX: an absolute executable path, cwd left as None
+unless a script overrides it, close_fds=False (pipes are non-inheritable
+anyway) and no preexec_fn/process_group/start_new_session. Adding any of
+those arguments silently falls back to the slower fork path.
 """
 
 import os
 import sys
+import shutil
 import subprocess
 import threading
-import queue
+import selectors
 import signal
 import time
-from pathlib import Path
 from typing import Dict, List, Optional, Callable, Any
 from datetime import datetime, timedelta
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 import shlex
+import itertools
 import psutil
+from sqlalchemy import select
 
 from ..core.logger import logger
 from ..core.database import get_db_manager
 
-class ScriptStatus(Enum):
-    """Script execution status"""
+class ScriptStatus(str, Enum):
+    """Script execution status (members compare and serialize as their value)"""
     PENDING = "pending"
     RUNNING = "running"
     SUCCESS = "success"
@@ -33,7 +41,7 @@ class ScriptStatus(Enum):
     CANCELLED = "cancelled"
     TIMEOUT = "timeout"
 
-@dataclass
+@dataclass(slots=True)
 class ScriptInfo:
     """Script information"""
     name: str
@@ -45,8 +53,20 @@ class ScriptInfo:
     environment: Dict[str, str] = None
     working_directory: str = None
     virtual: bool = False  # For virtual/generated scripts
+    _cached_env: Optional[Dict[str, str]] = field(default=None, init=False, repr=False, compare=False)
+    _cached_env_overrides: Optional[Dict[str, str]] = field(default=None, init=False, repr=False, compare=False)
+    
+    def get_environment(self) -> Dict[str, str]:
+        """Process environment merged with overrides, cached until the overrides change"""
+        overrides = self.environment or {}
+        if self._cached_env is None or self._cached_env_overrides != overrides:
+            env = os.environ.copy()
+            env.update(overrides)
+            self._cached_env = env
+            self._cached_env_overrides = dict(overrides)
+        return self._cached_env
 
-@dataclass
+@dataclass(slots=True)
 class ScriptExecution:
     """Script execution instance"""
     script_info: ScriptInfo
@@ -55,8 +75,8 @@ class ScriptExecution:
     start_time: Optional[datetime] = None
     end_time: Optional[datetime] = None
     process: Optional[subprocess.Popen] = None
-    output: List[str] = None
-    error_output: List[str] = None
+    output: List[str] = field(default_factory=list)
+    error_output: List[str] = field(default_factory=list)
     exit_code: Optional[int] = None
     
     def __post_init__(self):
@@ -76,11 +96,28 @@ class ScriptRunner:
         self.scripts: Dict[str, ScriptInfo] = {}
         self.running_executions: Dict[str, ScriptExecution] = {}
         
-        # Output queues for streaming
-        self.output_queues: Dict[str, queue.Queue] = {}
+        # Suffix that keeps execution ids unique when a script starts twice in a second
+        self._execution_seq = itertools.count(1)
+        
+        # IDs of executions currently in RUNNING state
+        self._running_index: set = set()
+        
+        # Guards insertion/removal on the dicts above; readers work on snapshots
+        self._executions_lock = threading.RLock()
+        
+        # Live child processes by PID, consumed by the reaper thread
+        self._pid_to_execution: Dict[int, ScriptExecution] = {}
+        self._child_exited = threading.Event()
+        
+        # Prefer pidfds (Linux 5.3+): one readable fd per child, no signals
+        self._pidfd_selector = self._create_pidfd_selector()
+        self._sigchld_installed = (
+            self._pidfd_selector is None and self._install_sigchld_handler()
+        )
         
         # Monitoring
         self.monitor_thread = None
+        self.reaper_thread = None
         self.monitor_active = False
         
         # Auto-discovery of scripts
@@ -96,17 +133,72 @@ class ScriptRunner:
         self.monitor_active = False
         
         # Stop all running scripts
-        for execution_id, execution in list(self.running_executions.items()):
+        for execution_id, execution in self._snapshot_executions():
             try:
                 self.stop_script(execution_id)
             except Exception as e:
                 logger.warning(f"Failed to stop script {execution_id}: {e}")
         
-        if self.monitor_thread and self.monitor_thread.is_alive():
-            self.monitor_thread.join(timeout=5)
+        self._child_exited.set()
+        for thread in (self.monitor_thread, self.reaper_thread):
+            if thread and thread.is_alive():
+                thread.join(timeout=5)
         
         logger.info("Script runner cleaned up")
     
+    @staticmethod
+    def _create_pidfd_selector() -> Optional[selectors.BaseSelector]:
+        """Return a selector for child pidfds, or None if the kernel lacks them"""
+        if not sys.platform.startswith('linux') or not hasattr(os, 'pidfd_open'):
+            return None
+        
+        try:
+            os.close(os.pidfd_open(os.getpid()))
+        except OSError:
+            return None
+        
+        return selectors.DefaultSelector()
+    
+    def _install_sigchld_handler(self) -> bool:
+        """Wake the reaper on SIGCHLD; only possible from the main thread on POSIX"""
+        if not hasattr(signal, 'SIGCHLD') or threading.current_thread() is not threading.main_thread():
+            return False
+        
+        previous = signal.getsignal(signal.SIGCHLD)
+        
+        def on_sigchld(signum, frame):
+            self._child_exited.set()
+            if callable(previous):
+                previous(signum, frame)
+        
+        try:
+            signal.signal(signal.SIGCHLD, on_sigchld)
+            return True
+        except (ValueError, OSError) as e:
+            logger.warning(f"Could not install SIGCHLD handler: {e}")
+            return False
+    
+    def _snapshot_executions(self) -> tuple:
+        """Copy-on-read snapshot of the running executions"""
+        with self._executions_lock:
+            return tuple(self.running_executions.items())
+    
+    def _set_status(self, execution: ScriptExecution, status: ScriptStatus):
+        """Change execution status and keep the running index in step"""
+        with self._executions_lock:
+            execution.status = status
+            if status == ScriptStatus.RUNNING:
+                self._running_index.add(execution.execution_id)
+            else:
+                self._running_index.discard(execution.execution_id)
+    
+    def _get_execution(self, execution_id: str) -> ScriptExecution:
+        """Look up an execution or raise if unknown"""
+        execution = self.running_executions.get(execution_id)
+        if execution is None:
+            raise ValueError(f"Execution {execution_id} not found")
+        return execution
+    
     def _discover_scripts(self):
         """Auto-discover Python scripts in the repository and register comprehensive script library"""
         # Legacy scripts in repository
@@ -117,8 +209,15 @@ class ScriptRunner:
             "gui.py"
         ]
         
+        # Single directory pass instead of a stat per file plus a glob
+        try:
+            entries = {entry.name for entry in os.scandir('.') if entry.is_file()}
+        except OSError as e:
+            logger.warning(f"Failed to scan for scripts: {e}")
+            entries = set()
+        
         for script_file in script_files:
-            if Path(script_file).exists():
+            if script_file in entries:
                 self.register_script(ScriptInfo(
                     name=script_file.replace('.py', '').replace(' ', '_'),
                     path=script_file,
@@ -127,14 +226,14 @@ class ScriptRunner:
                 ))
         
         # Discover PowerShell scripts
-        ps_files = Path('.').glob("*.ps1")
-        for ps_file in ps_files:
-            self.register_script(ScriptInfo(
-                name=ps_file.stem,
-                path=str(ps_file),
-                description=f"PowerShell script: {ps_file.name}",
-                category="powershell"
-            ))
+        for ps_file in sorted(entries):
+            if ps_file.endswith('.ps1'):
+                self.register_script(ScriptInfo(
+                    name=ps_file[:-len('.ps1')],
+                    path=ps_file,
+                    description=f"PowerShell script: {ps_file}",
+                    category="powershell"
+                ))
         
         # Add comprehensive library of finance and admin scripts
         self._register_comprehensive_scripts()
@@ -260,7 +359,7 @@ class ScriptRunner:
             raise ValueError(f"Script '{script_name}' not found")
         
         script_info = self.scripts[script_name]
-        execution_id = f"{script_name}_{int(time.time())}"
+        execution_id = f"{script_name}_{int(time.time())}_{next(self._execution_seq)}"
         
         # Create execution instance
         execution = ScriptExecution(
@@ -269,11 +368,8 @@ class ScriptRunner:
         )
         
         # Register execution
-        self.running_executions[execution_id] = execution
-        
-        # Create output queue
-        if output_callback:
-            self.output_queues[execution_id] = queue.Queue()
+        with self._executions_lock:
+            self.running_executions[execution_id] = execution
         
         # Log execution start to database
         db_execution = self.db_manager.log_script_start(script_name)
@@ -284,13 +380,12 @@ class ScriptRunner:
         try:
             # Start process
             execution.start_time = datetime.now()
-            execution.status = ScriptStatus.RUNNING
+            self._set_status(execution, ScriptStatus.RUNNING)
             
-            env = os.environ.copy()
-            if script_info.environment:
-                env.update(script_info.environment)
+            env = script_info.get_environment()
             
-            working_dir = script_info.working_directory or os.getcwd()
+            # None inherits our cwd and keeps the posix_spawn fast path
+            working_dir = script_info.working_directory or None
             
             execution.process = subprocess.Popen(
                 command,
@@ -299,24 +394,32 @@ class ScriptRunner:
                 universal_newlines=True,
                 bufsize=1,
                 cwd=working_dir,
-                env=env
+                env=env,
+                close_fds=os.name != 'posix'
             )
             
-            # Start output monitoring thread
-            if output_callback or execution_id in self.output_queues:
-                self._start_output_monitoring(execution, output_callback)
+            with self._executions_lock:
+                self._pid_to_execution[execution.process.pid] = execution
+            
+            if self._pidfd_selector is not None:
+                pidfd = os.pidfd_open(execution.process.pid)
+                self._pidfd_selector.register(pidfd, selectors.EVENT_READ, execution)
+                self._child_exited.set()
+            
+            # Start output monitoring thread; it also keeps the pipes drained
+            self._start_output_monitoring(execution, output_callback)
             
             logger.info(f"Started script {script_name} with PID {execution.process.pid}")
             return execution_id
             
         except Exception as e:
-            execution.status = ScriptStatus.FAILED
+            self._set_status(execution, ScriptStatus.FAILED)
             execution.end_time = datetime.now()
             
             # Log to database
             self.db_manager.log_script_end(
                 db_execution.id,
-                "failed",
+                ScriptStatus.FAILED,
                 error_output=str(e)
             )
             
@@ -337,42 +440,40 @@ class ScriptRunner:
             # Assume it's an executable
             command = [script_info.path] + args
         
+        # posix_spawn is only used for executables given with a directory
+        if not os.path.dirname(command[0]):
+            command[0] = shutil.which(command[0]) or command[0]
+        
         return command
     
     def _start_output_monitoring(self, execution: ScriptExecution, 
                                 callback: Callable[[str], None] = None):
         """Start monitoring script output"""
+        def emit(line: str, sink: List[str], prefix: str = ""):
+            line = line.strip()
+            if not line:
+                return
+            sink.append(line)
+            
+            if callback:
+                callback(f"{prefix}{line}")
+        
         def monitor_output():
             try:
                 # Monitor stdout
                 while execution.process.poll() is None:
                     line = execution.process.stdout.readline()
                     if line:
-                        line = line.strip()
-                        execution.output.append(line)
-                        
-                        if callback:
-                            callback(line)
-                        
-                        if execution.execution_id in self.output_queues:
-                            self.output_queues[execution.execution_id].put(line)
+                        emit(line, execution.output)
                 
-                # Get remaining output
+                # Feed remaining output through the same splitter
                 remaining_stdout, remaining_stderr = execution.process.communicate()
                 
-                if remaining_stdout:
-                    for line in remaining_stdout.strip().split('\n'):
-                        if line:
-                            execution.output.append(line)
-                            if callback:
-                                callback(line)
+                for line in (remaining_stdout or "").splitlines():
+                    emit(line, execution.output)
                 
-                if remaining_stderr:
-                    for line in remaining_stderr.strip().split('\n'):
-                        if line:
-                            execution.error_output.append(line)
-                            if callback:
-                                callback(f"ERROR: {line}")
+                for line in (remaining_stderr or "").splitlines():
+                    emit(line, execution.error_output, prefix="ERROR: ")
                 
             except Exception as e:
                 logger.error(f"Output monitoring error for {execution.execution_id}", exception=e)
@@ -382,28 +483,22 @@ class ScriptRunner:
     
     def get_script_output(self, execution_id: str) -> List[str]:
         """Get script output lines"""
-        if execution_id not in self.running_executions:
-            raise ValueError(f"Execution {execution_id} not found")
-        
-        execution = self.running_executions[execution_id]
+        execution = self._get_execution(execution_id)
         return execution.output.copy()
     
     def get_script_status(self, execution_id: str) -> ScriptStatus:
         """Get script execution status"""
-        if execution_id not in self.running_executions:
-            raise ValueError(f"Execution {execution_id} not found")
-        
-        return self.running_executions[execution_id].status
+        return self._get_execution(execution_id).status
     
-    def stop_script(self, execution_id: str) -> bool:
+    def stop_script(self, execution_id: str, status: ScriptStatus = ScriptStatus.CANCELLED) -> bool:
         """Stop a running script"""
-        if execution_id not in self.running_executions:
-            raise ValueError(f"Execution {execution_id} not found")
-        
-        execution = self.running_executions[execution_id]
+        execution = self._get_execution(execution_id)
         
         if execution.process and execution.process.poll() is None:
             try:
+                # Set before terminating so the reaper does not record FAILED
+                self._set_status(execution, status)
+                
                 # Try graceful termination first
                 execution.process.terminate()
                 
@@ -415,7 +510,6 @@ class ScriptRunner:
                     execution.process.kill()
                     execution.process.wait()
                 
-                execution.status = ScriptStatus.CANCELLED
                 execution.end_time = datetime.now()
                 execution.exit_code = execution.process.returncode
                 
@@ -428,49 +522,107 @@ class ScriptRunner:
         
         return False
     
+    def _complete_execution(self, execution: ScriptExecution):
+        """Record the exit of a reaped process"""
+        execution.end_time = execution.end_time or datetime.now()
+        execution.exit_code = execution.process.returncode
+        
+        # Keep CANCELLED/TIMEOUT set by stop_script
+        if execution.status == ScriptStatus.RUNNING:
+            if execution.exit_code == 0:
+                self._set_status(execution, ScriptStatus.SUCCESS)
+            else:
+                self._set_status(execution, ScriptStatus.FAILED)
+        
+        # Log to database
+        self._log_execution_complete(execution)
+    
+    def _reap_children(self):
+        """Wait for child exits and complete their executions"""
+        if self._pidfd_selector is not None:
+            self._reap_pidfds()
+            return
+        
+        # Without a SIGCHLD handler fall back to the old one-second poll
+        interval = 5 if self._sigchld_installed else 1
+        
+        while self.monitor_active:
+            self._child_exited.wait(timeout=interval)
+            self._child_exited.clear()
+            
+            try:
+                with self._executions_lock:
+                    tracked = tuple(self._pid_to_execution.items())
+                
+                for pid, execution in tracked:
+                    if execution.process.poll() is None:
+                        continue
+                    
+                    with self._executions_lock:
+                        self._pid_to_execution.pop(pid, None)
+                    self._complete_execution(execution)
+                    
+            except Exception as e:
+                logger.error("Reaper thread error", exception=e)
+    
+    def _reap_pidfds(self):
+        """Reaper loop driven by pidfd readiness"""
+        selector = self._pidfd_selector
+        
+        while self.monitor_active:
+            try:
+                # Empty selectors return immediately, so wait on the event instead
+                if not selector.get_map():
+                    self._child_exited.wait(timeout=1)
+                    self._child_exited.clear()
+                    continue
+                
+                for key, _ in selector.select(timeout=1):
+                    execution = key.data
+                    selector.unregister(key.fd)
+                    os.close(key.fd)
+                    
+                    # Readable pidfd means exited; wait() also waits out a
+                    # concurrent communicate() holding Popen's wait lock
+                    execution.process.wait()
+                    with self._executions_lock:
+                        self._pid_to_execution.pop(execution.process.pid, None)
+                    self._complete_execution(execution)
+                    
+            except Exception as e:
+                logger.error("Reaper thread error", exception=e)
+        
+        for key in list(selector.get_map().values()):
+            os.close(key.fd)
+        selector.close()
+    
     def _start_monitoring(self):
-        """Start the monitoring thread"""
+        """Start the reaper and timeout monitoring threads"""
         def monitor():
             while self.monitor_active:
                 try:
-                    # Check running executions
-                    for execution_id, execution in list(self.running_executions.items()):
-                        if execution.process and execution.process.poll() is not None:
-                            # Process has finished
-                            execution.end_time = datetime.now()
-                            execution.exit_code = execution.process.returncode
-                            
-                            if execution.exit_code == 0:
-                                execution.status = ScriptStatus.SUCCESS
-                            else:
-                                execution.status = ScriptStatus.FAILED
-                            
-                            # Log to database
-                            self._log_execution_complete(execution)
-                            
-                            # Clean up
-                            if execution_id in self.output_queues:
-                                del self.output_queues[execution_id]
-                        
-                        # Check for timeouts
-                        elif execution.status == ScriptStatus.RUNNING:
-                            runtime = datetime.now() - execution.start_time
+                    # Check for timeouts; exits are handled by the reaper
+                    snapshot = self._snapshot_executions()
+                    now = datetime.now()
+                    for execution_id, execution in snapshot:
+                        if execution.status == ScriptStatus.RUNNING and execution.start_time:
+                            runtime = now - execution.start_time
                             if runtime.total_seconds() > execution.script_info.timeout:
                                 logger.warning(f"Script {execution.script_info.name} timed out")
-                                self.stop_script(execution_id)
-                                execution.status = ScriptStatus.TIMEOUT
+                                self.stop_script(execution_id, status=ScriptStatus.TIMEOUT)
                     
                     # Clean up completed executions older than 1 hour
-                    cutoff_time = datetime.now() - timedelta(hours=1)
+                    cutoff_time = now - timedelta(hours=1)
                     completed_executions = [
-                        exec_id for exec_id, execution in self.running_executions.items()
+                        exec_id for exec_id, execution in snapshot
                         if execution.status in [ScriptStatus.SUCCESS, ScriptStatus.FAILED, 
                                               ScriptStatus.CANCELLED, ScriptStatus.TIMEOUT]
                         and execution.end_time and execution.end_time < cutoff_time
                     ]
                     
-                    for exec_id in completed_executions:
-                        del self.running_executions[exec_id]
+                    with self._executions_lock:
+                        for exec_id in completed_executions:
+                            self.running_executions.pop(exec_id, None)
                     
                     time.sleep(1)  # Check every second
                     
@@ -479,6 +631,8 @@ class ScriptRunner:
                     time.sleep(5)  # Wait longer if there's an error
         
         self.monitor_active = True
+        self.reaper_thread = threading.Thread(target=self._reap_children, daemon=True)
+        self.reaper_thread.start()
         self.monitor_thread = threading.Thread(target=monitor, daemon=True)
         self.monitor_thread.start()
         
@@ -499,10 +653,10 @@ class ScriptRunner:
                 if db_execution:
                     self.db_manager.log_script_end(
                         db_execution.id,
-                        execution.status.value,
+                        execution.status,
                         exit_code=execution.exit_code,
-                        output='\\n'.join(execution.output),
-                        error_output='\\n'.join(execution.error_output)
+                        output='\n'.join(execution.output),
+                        error_output='\n'.join(execution.error_output)
                     )
         except Exception as e:
             logger.error("Failed to log execution completion", exception=e)
@@ -513,40 +667,42 @@ class ScriptRunner:
             with self.db_manager.get_session() as session:
                 from ..core.database import ScriptExecution as DBScriptExecution
                 
-                executions = session.query(DBScriptExecution).order_by(
-                    DBScriptExecution.start_time.desc()
-                ).limit(limit).all()
-                
-                history = []
-                for execution in executions:
-                    history.append({
-                        'script_name': execution.script_name,
-                        'start_time': execution.start_time,
-                        'end_time': execution.end_time,
-                        'status': execution.status,
-                        'exit_code': execution.exit_code,
-                        'duration_seconds': execution.duration_seconds
-                    })
+                # Project just the columns we return; skips ORM hydration
+                rows = session.execute(
+                    select(
+                        DBScriptExecution.script_name,
+                        DBScriptExecution.start_time,
+                        DBScriptExecution.end_time,
+                        DBScriptExecution.status,
+                        DBScriptExecution.exit_code,
+                        DBScriptExecution.duration_seconds
+                    ).order_by(
+                        DBScriptExecution.start_time.desc()
+                    ).limit(limit)
+                ).all()
                 
-                return history
+                return [row._asdict() for row in rows]
         except Exception as e:
             logger.error("Failed to get execution history", exception=e)
             return []
     
     def get_running_scripts(self) -> List[Dict[str, Any]]:
         """Get currently running scripts"""
-        running = []
-        for execution_id, execution in self.running_executions.items():
-            if execution.status == ScriptStatus.RUNNING:
-                runtime = datetime.now() - execution.start_time if execution.start_time else timedelta(0)
-                running.append({
-                    'execution_id': execution_id,
-                    'script_name': execution.script_info.name,
-                    'start_time': execution.start_time,
-                    'runtime_seconds': runtime.total_seconds(),
-                    'pid': execution.process.pid if execution.process else None
-                })
-        return running
+        with self._executions_lock:
+            executions = [self.running_executions[execution_id] for execution_id in self._running_index
+                          if execution_id in self.running_executions]
+        
+        now = datetime.now()
+        return [
+            {
+                'execution_id': execution.execution_id,
+                'script_name': execution.script_info.name,
+                'start_time': execution.start_time,
+                'runtime_seconds': (now - execution.start_time).total_seconds() if execution.start_time else 0.0,
+                'pid': execution.process.pid if execution.process else None
+            }
+            for execution in executions
+        ]
     
     def schedule_script(self, script_name: str, schedule_time: datetime, 
                        args: List[str] = None) -> str:
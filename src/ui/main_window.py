@@ -9,39 +9,170 @@ Excel management, email tools, and script runner.
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 import threading
-import queue
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import json
+import random
+import re
+import importlib.util
+from collections import deque
+from itertools import combinations
 
 # Data processing
 import pandas as pd
+import xlsxwriter
 try:
     import numpy as np
     NUMPY_AVAILABLE = True
 except ImportError:
     NUMPY_AVAILABLE = False
 
-# Try to import matplotlib for charts
-try:
-    import matplotlib.pyplot as plt
-    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-    import matplotlib.dates as mdates
-    MATPLOTLIB_AVAILABLE = True
-except ImportError:
-    MATPLOTLIB_AVAILABLE = False
+# matplotlib is imported when the first chart is drawn; only check for it here
+MATPLOTLIB_AVAILABLE = importlib.util.find_spec("matplotlib") is not None
 
 from ..core.logger import logger
 from ..core.config import DashboardConfig
 from ..modules.excel_handler import ExcelHandler
-from ..modules.email_handler import EmailHandler, EmailRecipient
+from ..modules.email_handler import EmailHandler, EmailRecipient, EmailTemplate
 from ..modules.script_runner import ScriptRunner
 from ..modules.ai_assistant import AIAssistant
 
+# ttk style options for the dark theme, applied by MainWindow._setup_styles
+# Frames, labels and labelframes inherit their colours from "."
+_DARK_STYLE = {
+    ".": {"background": "#2b2b2b", "foreground": "#ffffff",
+          "fieldbackground": "#1e1e1e", "bordercolor": "#555555"},
+    "TNotebook": {"borderwidth": 0},
+    "TNotebook.Tab": {"background": "#3c3c3c", "padding": [12, 8]},
+    "TButton": {"background": "#0078d4"},
+    "TEntry": {"fieldbackground": "#1e1e1e", "foreground": "#ffffff", "bordercolor": "#555555"},
+    "TCombobox": {"fieldbackground": "#1e1e1e", "foreground": "#ffffff", "bordercolor": "#555555"},
+    "Treeview": {"background": "#1e1e1e", "foreground": "#ffffff", "fieldbackground": "#1e1e1e"},
+    "Treeview.Heading": {"background": "#3c3c3c", "foreground": "#ffffff"},
+}
+
+_DARK_STYLE_MAPS = {
+    "TNotebook.Tab": {"background": [("selected", "#0078d4")]},
+    "TButton": {"background": [("active", "#106ebe")]},
+    "TEntry": {"focuscolor": [("!focus", "#555555")]},
+    "TCombobox": {"focuscolor": [("!focus", "#555555")]},
+    "Treeview": {"background": [("selected", "#0078d4")]},
+}
+
+# Recipient address check: a dot somewhere after the first '@'
+_EMAIL_RE = re.compile(r'[^@]*@[^@]*\.')
+
+# One recipient per line: "Name <email>", "\"Name\" <email>" or a bare address
+_RECIPIENT_LINE_RE = re.compile(
+    r'^[ \t]*(?:"?([^"<\n]*?)"?[ \t]*<)?([^@\s<>]+@[^>\s]+)>?[ \t]*$', re.M)
+
+# Separators between several recipients pasted onto one line
+_RECIPIENT_SEPARATOR_RE = re.compile(r'[;,]')
+
+
+def _parse_recipient_lines(text: str) -> Tuple[List[EmailRecipient], List[str]]:
+    """Parse recipients one per line (or ; / , separated); returns them and the unreadable lines"""
+    recipients = []
+    rejected = []
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        
+        match = _RECIPIENT_LINE_RE.fullmatch(line)
+        matches = [match] if match else [
+            _RECIPIENT_LINE_RE.fullmatch(part)
+            for part in _RECIPIENT_SEPARATOR_RE.split(line) if part.strip()
+        ]
+        if not matches or not all(matches):
+            rejected.append(line.strip())
+            continue
+        
+        recipients.extend(
+            EmailRecipient(email=match.group(2), name=(match.group(1) or "").strip())
+            for match in matches
+        )
+    return recipients, rejected
+
+# Sample series plotted by the analytics charts, keyed by chart type; the
+# chart skip key is built from these, so swapping in real data refreshes it
+_CHART_SAMPLE_DATA = {
+    "transactions_by_month": {
+        "months": ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun'),
+        "transactions": (245, 312, 189, 387, 423, 301),
+        "amounts": (12500, 18750, 9500, 22300, 28900, 15600),
+    },
+    "spending_by_cardholder": {
+        "cardholders": ('John Smith', 'Sarah Jones', 'Mike Wilson', 'Lisa Brown', 'David Lee'),
+        "spending": (2850, 4200, 1950, 3100, 2600),
+    },
+    "category_breakdown": {
+        "categories": ('Travel', 'Office Supplies', 'IT Equipment', 'Catering', 'Training', 'Other'),
+        "amounts": (8500, 3200, 12000, 2100, 4800, 1900),
+    },
+    "monthly_trends": {
+        "months": ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'),
+        "current_year": (15000, 18000, 14500, 22000, 25000, 19000, 21000, 23000, 18500, 26000, 24000, 20000),
+        "previous_year": (12000, 16000, 13000, 19000, 22000, 17000, 18000, 20000, 16000, 23000, 21000, 18000),
+    },
+    "email_statistics": {
+        "categories": ('Statements Sent', 'Reminders', 'Approvals', 'Notifications', 'Reports'),
+        "sent": (245, 180, 95, 320, 75),
+        "opened": (220, 165, 88, 290, 68),
+        "clicked": (185, 120, 76, 210, 55),
+    },
+}
+
+# Help text for the email variables popup
+_EMAIL_VARIABLES_HELP = """Available Variables:
+
+{name} - Recipient name
+{email} - Recipient email
+{card_number} - Card number (last 4 digits)
+{department} - Department
+{manager_email} - Manager email
+{today} - Current date
+{month} - Current month
+{year} - Current year
+{amount} - Transaction amount
+{currency} - Currency code
+
+Usage: Include variables in subject or body using {variable_name} format.
+Example: "Dear {name}, your card ending in {card_last4} has..."
+"""
+
 class MainWindow:
     """Advanced main window with tabbed interface"""
     
+    # Fallback Treeview row height (px) when the theme does not set one
+    DEFAULT_ROW_HEIGHT = 20
+    
+    # Bounds for the recent-activity list, the script output pane and the AI chat
+    ACTIVITY_LIMIT = 50
+    SCRIPT_OUTPUT_MAX_LINES = 2000
+    AI_CHAT_MAX_LINES = 2000
+    # Minimum gap between script output redraws (~30 per second)
+    SCRIPT_OUTPUT_FLUSH_MS = 33
+    
+    # Recipients per bulk email job; each job holds one SMTP session
+    BULK_EMAIL_CHUNK_SIZE = 100
+    
+    # Methods that may be invoked through post_command
+    QUEUED_COMMANDS = (
+        "_add_activity",
+        "_update_kpi",
+        "_on_cardholders_loaded",
+        "_on_cardholders_page_loaded",
+        "_on_cardholders_counted",
+        "_on_cardholder_deleted",
+        "_on_cardholders_imported",
+        "_on_cardholders_exported",
+        "_on_bulk_email_sent",
+        "_flush_script_output",
+    )
+    
     def __init__(self, config: DashboardConfig):
         self.config = config
         self.root = tk.Tk()
@@ -57,12 +188,81 @@ class MainWindow:
         # UI Components
         self.notebook = None
         self.status_bar = None
-        self.command_queue = queue.Queue()
+        self.cardholders_tree = None
+        self._cardholders_tab = None
+        self._cardholders_dirty = False
+        self.running_scripts_tree = None
+        self.template_combo = None
+        # Attachment paths parsed from the last attachments_var value
+        self._attachments_raw = ""
+        self._attachments: List[str] = []
+        self._tab_builders: Dict[str, Any] = {}
+        # Single consumer (Tk thread); deque append/popleft are atomic
+        self.command_queue = deque()
+        self._command_wakeup_pending = False
+        # Script output lines from runner threads, written to the pane in one batch
+        self._script_output_pending = deque()
+        self._script_output_flush_pending = False
+        self._script_output_flushed_at = 0.0
+        self._ai_scroll_scheduled = False
+        self._cmd_dispatch = {name: getattr(self, name) for name in self.QUEUED_COMMANDS}
+        
+        # Blocking DB/file work runs here; results come back via post_command
+        self._io_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ui-io")
+        # Bulk email chunks run in parallel up to the server's connection limit
+        self._email_pool = ThreadPoolExecutor(
+            max_workers=max(1, self.config.email.max_connections), thread_name_prefix="ui-email")
+        
+        # Colour overrides for classic Tk widgets; the light theme keeps Tk defaults
+        if self.config.ui.theme == "dark":
+            self._text_kwargs = {"bg": "#1e1e1e", "fg": "#ffffff", "insertbackground": "#ffffff"}
+        else:
+            self._text_kwargs = {}
         
         # Data
         self.cardholders = []
+        # Treeview values for self.cardholders, built once per load
+        self._all_cardholder_rows: List[tuple] = []
+        self._cardholders_by_card: Dict[str, Any] = {}
+        # Lowercased searchable text per cardholder, index-aligned with the rows
+        self._cardholder_search_keys: List[str] = []
+        # Add-cardholder dialog, built on first use and then withdrawn/reshown
+        self._add_cardholder_dialog = None
+        self._add_cardholder_fields: Dict[str, tk.Entry] = {}
+        # Bumped per _load_initial_data so a late first page cannot replace a full load
+        self._cardholder_load_id = 0
+        self._first_page_load_id = None
+        self._cardholders_version = None
         self.current_data = None
         
+        self._filter_after_id = None
+        
+        # Rows for the current view; the tree only holds the visible window,
+        # starting at _cardholder_first, in item ids "0".."n-1"
+        self._cardholder_rows: List[tuple] = []
+        self._cardholder_first = 0
+        self._cardholder_window = 0
+        # Pixels above the first row (heading and border); measured once rows exist
+        self._cardholder_heading_height: Optional[int] = None
+        # Values currently shown in each slot, so unchanged slots are skipped
+        self._cardholder_slot_values: List[tuple] = []
+        # Script list rows keyed by script name (also the tree item id)
+        self._script_rows: Dict[str, tuple] = {}
+        self._scripts_by_name: Dict[str, Any] = {}
+        
+        # Last values pushed to widgets, so unchanged ticks skip the Tcl call
+        self._kpi_cache: Dict[str, str] = {}
+        self._kpi_db_version = None
+        self._activity_ring = deque(maxlen=self.ACTIVITY_LIMIT)
+        # Messages waiting for the next idle flush, newest last
+        self._activity_pending = deque(maxlen=self.ACTIVITY_LIMIT)
+        self._activity_flush_scheduled = False
+        self._activity_second = None
+        self._activity_timestamp = ""
+        self._last_time_str = None
+        # Running executions shown, keyed by execution id (also the tree item id)
+        self._running_by_id: Dict[str, Dict[str, Any]] = {}
+        
         # Initialize UI
         self._setup_styles()
         self._create_menu()
@@ -83,28 +283,10 @@ class MainWindow:
             # Dark theme configuration
             style.theme_use("clam")
             
-            # Configure dark colors
-            style.configure(".", background="#2b2b2b", foreground="#ffffff", 
-                          fieldbackground="#1e1e1e", bordercolor="#555555")
-            style.configure("TNotebook", background="#2b2b2b", borderwidth=0)
-            style.configure("TNotebook.Tab", background="#3c3c3c", foreground="#ffffff",
-                          padding=[12, 8])
-            style.map("TNotebook.Tab", background=[("selected", "#0078d4")])
-            style.configure("TFrame", background="#2b2b2b")
-            style.configure("TLabel", background="#2b2b2b", foreground="#ffffff")
-            style.configure("TLabelFrame", background="#2b2b2b", foreground="#ffffff")
-            style.configure("TLabelFrame.Label", background="#2b2b2b", foreground="#ffffff")
-            style.configure("TButton", background="#0078d4", foreground="#ffffff")
-            style.map("TButton", background=[("active", "#106ebe")])
-            style.configure("TEntry", fieldbackground="#1e1e1e", foreground="#ffffff", bordercolor="#555555")
-            style.configure("TCombobox", fieldbackground="#1e1e1e", foreground="#ffffff", bordercolor="#555555")
-            style.map("TEntry", focuscolor=[("!focus", "#555555")])
-            style.map("TCombobox", focuscolor=[("!focus", "#555555")])
-            
-            # Treeview styling
-            style.configure("Treeview", background="#1e1e1e", foreground="#ffffff", fieldbackground="#1e1e1e")
-            style.configure("Treeview.Heading", background="#3c3c3c", foreground="#ffffff")
-            style.map("Treeview", background=[("selected", "#0078d4")])
+            for selector, options in _DARK_STYLE.items():
+                style.configure(selector, **options)
+            for selector, options in _DARK_STYLE_MAPS.items():
+                style.map(selector, **options)
             
             # Configure root window
             self.root.configure(bg="#2b2b2b")
@@ -147,15 +329,41 @@ class MainWindow:
         self.notebook = ttk.Notebook(self.root)
         self.notebook.pack(fill="both", expand=True, padx=5, pady=(5, 0))
         
-        # Create tabs
+        # Dashboard is shown first, so build it now
         self._create_dashboard_tab()
-        self._create_cardholders_tab()
-        self._create_statements_tab()
-        self._create_email_tab()
-        self._create_scripts_tab()
-        self._create_analytics_tab()
+        
+        # Other tabs get an empty frame and are built on first selection
+        lazy_tabs = [
+            ("Cardholders", self._build_cardholders_tab),
+            ("Statements", self._create_statements_tab),
+            ("Email", self._create_email_tab),
+            ("Scripts", self._create_scripts_tab),
+            ("Analytics", self._create_analytics_tab),
+        ]
         if self.ai_assistant:
-            self._create_ai_tab()
+            lazy_tabs.append(("AI Assistant", self._create_ai_tab))
+        
+        for text, builder in lazy_tabs:
+            frame = ttk.Frame(self.notebook)
+            self.notebook.add(frame, text=text)
+            self._tab_builders[str(frame)] = builder
+        
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+    
+    def _on_tab_changed(self, event=None):
+        """Build the selected tab the first time it is shown"""
+        selected = self.notebook.select()
+        builder = self._tab_builders.pop(selected, None)
+        if builder:
+            builder(self.notebook.nametowidget(selected))
+        elif selected == self._cardholders_tab and self._cardholders_dirty:
+            self._refresh_cardholders_tree()
+    
+    def _build_cardholders_tab(self, frame):
+        """Build cardholders tab and fill it with already-loaded data"""
+        self._cardholders_tab = str(frame)
+        self._create_cardholders_tab(frame)
+        self._refresh_cardholders_tree()
     
     def _create_dashboard_tab(self):
         """Create main dashboard tab"""
@@ -187,7 +395,8 @@ class MainWindow:
             card = self._create_kpi_card(kpi_cards_frame, title, value, color)
             card.grid(row=0, column=i, padx=5, sticky="ew")
             self.kpi_cards[title] = card
-            kpi_cards_frame.columnconfigure(i, weight=1)
+        # One columnconfigure for all columns (Tk accepts an index list)
+        kpi_cards_frame.columnconfigure(tuple(range(len(kpi_data))), weight=1)
         
         # Quick Actions Section
         actions_frame = ttk.LabelFrame(main_frame, text="Quick Actions", padding=10)
@@ -208,27 +417,22 @@ class MainWindow:
         for text, command, row, col in actions:
             btn = ttk.Button(actions_grid, text=text, command=command)
             btn.grid(row=row, column=col, padx=5, pady=5, sticky="ew")
-            actions_grid.columnconfigure(col, weight=1)
+        actions_grid.columnconfigure(tuple({col for *_, col in actions}), weight=1)
         
         # Recent Activity Section
         activity_frame = ttk.LabelFrame(main_frame, text="Recent Activity", padding=10)
         activity_frame.pack(fill="both", expand=True)
         
-        # Activity listbox with scrollbar
+        # Activity list (headerless single-column tree) with scrollbar
         activity_list_frame = ttk.Frame(activity_frame)
         activity_list_frame.pack(fill="both", expand=True)
         
-        self.activity_listbox = tk.Listbox(
-            activity_list_frame,
-            font=(self.config.ui.font_family, self.config.ui.font_size),
-            bg="#1e1e1e" if self.config.ui.theme == "dark" else "#ffffff",
-            fg="#ffffff" if self.config.ui.theme == "dark" else "#000000",
-            selectbackground="#0078d4"
-        )
-        scrollbar = ttk.Scrollbar(activity_list_frame, orient="vertical", command=self.activity_listbox.yview)
-        self.activity_listbox.configure(yscrollcommand=scrollbar.set)
+        self.activity_tree = ttk.Treeview(activity_list_frame, columns=("message",), show="")
+        self.activity_tree.column("message", stretch=True)
+        scrollbar = ttk.Scrollbar(activity_list_frame, orient="vertical", command=self.activity_tree.yview)
+        self.activity_tree.configure(yscrollcommand=scrollbar.set)
         
-        self.activity_listbox.pack(side="left", fill="both", expand=True)
+        self.activity_tree.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
         
         # Add some sample activities
@@ -256,10 +460,8 @@ class MainWindow:
         
         return card_frame
     
-    def _create_cardholders_tab(self):
+    def _create_cardholders_tab(self, frame):
         """Create cardholders management tab"""
-        frame = ttk.Frame(self.notebook)
-        self.notebook.add(frame, text="Cardholders")
         
         # Main container
         main_frame = ttk.Frame(frame)
@@ -298,10 +500,20 @@ class MainWindow:
             self.cardholders_tree.heading(col, text=col)
             self.cardholders_tree.column(col, width=150)
         
-        # Scrollbars
-        v_scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=self.cardholders_tree.yview)
+        # Scrollbars; vertical scrolling moves the row window, not the tree
+        v_scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=self._scroll_cardholders)
         h_scrollbar = ttk.Scrollbar(tree_frame, orient="horizontal", command=self.cardholders_tree.xview)
-        self.cardholders_tree.configure(yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set)
+        self._cardholders_vscroll = v_scrollbar
+        self.cardholders_tree.configure(xscrollcommand=h_scrollbar.set)
+        
+        # Until the first <Configure>, show as many rows as the requested height
+        self._cardholder_window = int(self.cardholders_tree.cget("height"))
+        self.cardholders_tree.bind("<Configure>", self._on_cardholders_resize)
+        self.cardholders_tree.bind("<MouseWheel>", lambda e: self._scroll_cardholders("scroll", -3 if e.delta > 0 else 3, "units"))
+        self.cardholders_tree.bind("<Button-4>", lambda e: self._scroll_cardholders("scroll", -3, "units"))
+        self.cardholders_tree.bind("<Button-5>", lambda e: self._scroll_cardholders("scroll", 3, "units"))
+        self.cardholders_tree.bind("<Up>", lambda e: self._step_cardholder_selection(-1))
+        self.cardholders_tree.bind("<Down>", lambda e: self._step_cardholder_selection(1))
         
         # Pack treeview and scrollbars
         self.cardholders_tree.grid(row=0, column=0, sticky="nsew")
@@ -311,10 +523,8 @@ class MainWindow:
         tree_frame.columnconfigure(0, weight=1)
         tree_frame.rowconfigure(0, weight=1)
     
-    def _create_statements_tab(self):
+    def _create_statements_tab(self, frame):
         """Create statements generation tab"""
-        frame = ttk.Frame(self.notebook)
-        self.notebook.add(frame, text="Statements")
         
         main_frame = ttk.Frame(frame)
         main_frame.pack(fill="both", expand=True, padx=10, pady=10)
@@ -328,8 +538,9 @@ class MainWindow:
         period_frame.pack(fill="x", pady=(0, 10))
         
         ttk.Label(period_frame, text="Period:").pack(side="left")
-        self.statement_month_var = tk.StringVar(value=datetime.now().strftime("%B"))
-        self.statement_year_var = tk.StringVar(value=str(datetime.now().year))
+        today = datetime.now()
+        self.statement_month_var = tk.StringVar(value=today.strftime("%B"))
+        self.statement_year_var = tk.StringVar(value=str(today.year))
         
         month_combo = ttk.Combobox(period_frame, textvariable=self.statement_month_var, width=10)
         month_combo['values'] = ('January', 'February', 'March', 'April', 'May', 'June',
@@ -387,10 +598,8 @@ class MainWindow:
         # Context menu for statements
         self.statements_tree.bind("<Button-3>", self._show_statement_context_menu)
     
-    def _create_email_tab(self):
+    def _create_email_tab(self, frame):
         """Create email management tab"""
-        frame = ttk.Frame(self.notebook)
-        self.notebook.add(frame, text="Email")
         
         # Create paned window for layout
         paned = ttk.PanedWindow(frame, orient="horizontal")
@@ -405,9 +614,15 @@ class MainWindow:
         templates_frame.pack(fill="x", pady=(0, 10))
         
         self.template_var = tk.StringVar()
-        template_combo = ttk.Combobox(templates_frame, textvariable=self.template_var, width=30)
+        self.template_combo = template_combo = ttk.Combobox(
+            templates_frame, textvariable=self.template_var, width=30)
         template_combo.pack(fill="x", pady=(0, 10))
         
+        # Template names are looked up when the dropdown opens
+        template_combo.configure(
+            postcommand=lambda: template_combo.configure(values=self.email_handler.list_templates())
+        )
+        
         template_buttons = ttk.Frame(templates_frame)
         template_buttons.pack(fill="x")
         ttk.Button(template_buttons, text="Load", command=self._load_email_template).pack(side="left", padx=(0, 5))
@@ -424,9 +639,8 @@ class MainWindow:
             recipients_frame, 
             height=8, 
             width=40,
-            bg="#1e1e1e" if self.config.ui.theme == "dark" else "#ffffff",
-            fg="#ffffff" if self.config.ui.theme == "dark" else "#000000",
-            insertbackground="#ffffff" if self.config.ui.theme == "dark" else "#000000"
+            exportselection=False,
+            **self._text_kwargs
         )
         self.recipients_text.pack(fill="both", expand=True, pady=(5, 10))
         
@@ -457,9 +671,8 @@ class MainWindow:
         self.email_body_text = scrolledtext.ScrolledText(
             compose_frame, 
             height=15,
-            bg="#1e1e1e" if self.config.ui.theme == "dark" else "#ffffff",
-            fg="#ffffff" if self.config.ui.theme == "dark" else "#000000",
-            insertbackground="#ffffff" if self.config.ui.theme == "dark" else "#000000"
+            exportselection=False,
+            **self._text_kwargs
         )
         self.email_body_text.pack(fill="both", expand=True, pady=(5, 10))
         
@@ -477,14 +690,9 @@ class MainWindow:
         ttk.Button(send_frame, text="Send Test Email", command=self._send_test_email_tab).pack(side="left", padx=(0, 10))
         ttk.Button(send_frame, text="Send to All Recipients", command=self._send_bulk_email).pack(side="left", padx=(0, 10))
         ttk.Button(send_frame, text="Preview Variables", command=self._preview_email_variables).pack(side="left")
-        
-        # Load templates
-        self._refresh_email_templates()
     
-    def _create_scripts_tab(self):
+    def _create_scripts_tab(self, frame):
         """Create script management tab"""
-        frame = ttk.Frame(self.notebook)
-        self.notebook.add(frame, text="Scripts")
         
         # Create paned window
         paned = ttk.PanedWindow(frame, orient="horizontal")
@@ -538,19 +746,16 @@ class MainWindow:
         self.script_output_text = scrolledtext.ScrolledText(
             output_frame, 
             height=15,
-            bg="#1e1e1e" if self.config.ui.theme == "dark" else "#ffffff",
-            fg="#ffffff" if self.config.ui.theme == "dark" else "#000000",
-            insertbackground="#ffffff" if self.config.ui.theme == "dark" else "#000000"
+            exportselection=False,
+            **self._text_kwargs
         )
         self.script_output_text.pack(fill="both", expand=True)
         
         # Populate scripts list
         self._refresh_scripts_list()
     
-    def _create_analytics_tab(self):
+    def _create_analytics_tab(self, frame):
         """Create analytics and charts tab"""
-        frame = ttk.Frame(self.notebook)
-        self.notebook.add(frame, text="Analytics")
         
         main_frame = ttk.Frame(frame)
         main_frame.pack(fill="both", expand=True, padx=10, pady=10)
@@ -581,8 +786,11 @@ class MainWindow:
             self.chart_frame = ttk.LabelFrame(main_frame, text="Chart Display", padding=10)
             self.chart_frame.pack(fill="both", expand=True)
             
-            # Placeholder for matplotlib canvas
+            # Figure and canvas are created on first chart and then reused
+            self.chart_figure = None
             self.chart_canvas = None
+            # (chart type, plotted data) of the chart on screen
+            self._chart_key = None
         else:
             no_charts_frame = ttk.LabelFrame(main_frame, text="Chart Display", padding=10)
             no_charts_frame.pack(fill="both", expand=True)
@@ -590,10 +798,8 @@ class MainWindow:
                      text="Charts not available\\nInstall matplotlib for chart functionality",
                      font=(self.config.ui.font_family, 12)).pack(expand=True)
     
-    def _create_ai_tab(self):
+    def _create_ai_tab(self, frame):
         """Create AI assistant tab"""
-        frame = ttk.Frame(self.notebook)
-        self.notebook.add(frame, text="AI Assistant")
         
         main_frame = ttk.Frame(frame)
         main_frame.pack(fill="both", expand=True, padx=10, pady=10)
@@ -607,8 +813,8 @@ class MainWindow:
             chat_frame, 
             height=15,
             state="disabled",
-            bg="#1e1e1e" if self.config.ui.theme == "dark" else "#ffffff",
-            fg="#ffffff" if self.config.ui.theme == "dark" else "#000000"
+            exportselection=False,
+            **self._text_kwargs
         )
         self.ai_chat_text.pack(fill="both", expand=True, pady=(0, 10))
         
@@ -675,28 +881,42 @@ class MainWindow:
         # Update status
         self._update_status()
         
-        # Process command queue
-        self.root.after(100, self._process_command_queue)
+        # Process command queue when post_command wakes us, not on a timer
+        self.root.bind("<<CommandQueued>>", self._process_command_queue)
+        
+        # Pick up anything posted before the main loop was running
+        self.root.after_idle(self._process_command_queue)
     
     def _update_time(self):
         """Update time display"""
-        current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self.time_var.set(current_time)
-        self.root.after(1000, self._update_time)
+        current_time = time.strftime("%Y-%m-%d %H:%M:%S")
+        if current_time != self._last_time_str:
+            self.time_var.set(current_time)
+            self._last_time_str = current_time
+        
+        # Wake just after the next whole second so ticks don't drift
+        self.root.after(1000 - int(time.time() * 1000) % 1000 + 1, self._update_time)
     
     def _update_status(self):
         """Update various status indicators"""
         try:
-            # Update KPIs
-            cardholders_count = len(self.excel_handler.db_manager.get_cardholders())
-            self._update_kpi("Total Cardholders", str(cardholders_count))
+            # Recount cardholders off the Tk thread, only after a DB commit
+            db_version = self.excel_handler.db_manager.version
+            if db_version != self._kpi_db_version:
+                self._kpi_db_version = db_version
+                future = self._io_pool.submit(self.excel_handler.db_manager.count_cardholders)
+                future.add_done_callback(
+                    lambda f: self.post_command("_on_cardholders_counted", f))
             
             # Update running scripts
             running_scripts = self.script_runner.get_running_scripts()
             self._update_kpi("Running Scripts", str(len(running_scripts)))
             
             # Update running scripts tree
-            self._update_running_scripts_tree()
+            self._update_running_scripts_tree(running_scripts)
+            
+            # One redraw for all of the above
+            self.root.update_idletasks()
             
         except Exception as e:
             logger.error("Status update failed", exception=e)
@@ -704,27 +924,79 @@ class MainWindow:
         # Schedule next update
         self.root.after(5000, self._update_status)  # Update every 5 seconds
     
-    def _process_command_queue(self):
+    def _on_cardholders_counted(self, future: Future):
+        """Apply a background cardholder count to the KPI card"""
+        try:
+            self._update_kpi("Total Cardholders", str(future.result()))
+        except Exception as e:
+            self._kpi_db_version = None
+            logger.error("Failed to count cardholders", exception=e)
+    
+    def post_command(self, command: str, *args):
+        """Queue a method call for the Tk thread; safe to call from any thread"""
+        self.command_queue.append((command, args))
+        
+        # One wakeup per drain, however many commands arrive in between
+        if not self._command_wakeup_pending:
+            self._command_wakeup_pending = True
+            try:
+                self.root.event_generate("<<CommandQueued>>", when="tail")
+            except (RuntimeError, tk.TclError):
+                # Main loop not running yet; the startup drain picks it up
+                self._command_wakeup_pending = False
+    
+    def _process_command_queue(self, event=None):
         """Process queued commands"""
+        self._command_wakeup_pending = False
         try:
-            while not self.command_queue.empty():
-                command, args = self.command_queue.get_nowait()
-                if hasattr(self, command):
-                    method = getattr(self, command)
+            while self.command_queue:
+                command, args = self.command_queue.popleft()
+                method = self._cmd_dispatch.get(command)
+                if method:
                     method(*args)
-        except queue.Empty:
+                else:
+                    logger.warning(f"Ignoring unknown queued command: {command}")
+        except IndexError:
             pass
         except Exception as e:
             logger.error("Command queue processing failed", exception=e)
-        
-        # Schedule next check
-        self.root.after(100, self._process_command_queue)
     
     def _load_initial_data(self):
-        """Load initial data"""
+        """Load initial data in the background"""
+        db_manager = self.excel_handler.db_manager
+        
+        # The loaded list is current until the next commit bumps the version
+        db_version = db_manager.version
+        if db_version == self._cardholders_version:
+            return
+        
+        self._cardholder_load_id += 1
+        load_id = self._cardholder_load_id
+        
+        # With the tree on screen, paint the first window while the full list loads
+        if self.cardholders_tree is not None:
+            self._first_page_load_id = load_id
+            page = self._io_pool.submit(db_manager.get_cardholders_page, 0, self._cardholder_window)
+            page.add_done_callback(lambda f: self.post_command("_on_cardholders_page_loaded", load_id, f))
+        
+        future = self._io_pool.submit(db_manager.get_cardholders)
+        future.add_done_callback(lambda f: self.post_command("_on_cardholders_loaded", db_version, f))
+    
+    def _on_cardholders_page_loaded(self, load_id: int, future: Future):
+        """Show the first page unless the full list has already arrived"""
+        if load_id != self._first_page_load_id:
+            return
         try:
-            # Load cardholders
-            self.cardholders = self.excel_handler.db_manager.get_cardholders()
+            self._show_cardholder_rows([self._cardholder_row(c) for c in future.result()])
+        except Exception as e:
+            logger.warning(f"Failed to load first cardholder page: {e}")
+    
+    def _on_cardholders_loaded(self, db_version: int, future: Future):
+        """Apply cardholders loaded by _load_initial_data"""
+        self._first_page_load_id = None
+        try:
+            self._set_cardholders(future.result())
+            self._cardholders_version = db_version
             self._refresh_cardholders_tree()
             
             # Add initial activity
@@ -734,38 +1006,223 @@ class MainWindow:
             logger.error("Failed to load initial data", exception=e)
             self._add_activity(f"Error loading data: {e}")
     
-    def _add_activity(self, message):
-        """Add activity to the recent activity list"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        activity_item = f"[{timestamp}] {message}"
+    def _set_cardholders(self, cardholders):
+        """Replace loaded cardholders"""
+        self.cardholders = cardholders
+        self._all_cardholder_rows = [self._cardholder_row(c) for c in cardholders]
+        self._cardholders_by_card = {c.card_number: c for c in cardholders}
+        self._cardholder_search_keys = [self._cardholder_search_key(c) for c in cardholders]
+    
+    def _add_cardholder_locally(self, cardholder):
+        """Append one cardholder without rebuilding the cached rows"""
+        self.cardholders.append(cardholder)
+        self._all_cardholder_rows.append(self._cardholder_row(cardholder))
+        self._cardholders_by_card[cardholder.card_number] = cardholder
+        self._cardholder_search_keys.append(self._cardholder_search_key(cardholder))
+    
+    def _remove_cardholder_locally(self, card_number: str):
+        """Drop one cardholder from the list and cached rows"""
+        cardholder = self._cardholders_by_card.pop(card_number, None)
+        if cardholder is not None:
+            index = self.cardholders.index(cardholder)
+            del self.cardholders[index]
+            del self._all_cardholder_rows[index]
+            del self._cardholder_search_keys[index]
+    
+    def _replace_cardholder_locally(self, card_number: str, cardholder):
+        """Swap in an edited cardholder without rebuilding the cached rows"""
+        # Only active cardholders are listed
+        if not cardholder.active:
+            self._remove_cardholder_locally(card_number)
+            return
         
-        self.activity_listbox.insert(0, activity_item)
+        previous = self._cardholders_by_card.pop(card_number, None)
+        if previous is None:
+            self._add_cardholder_locally(cardholder)
+            return
         
-        # Keep only last 50 items
-        if self.activity_listbox.size() > 50:
-            self.activity_listbox.delete(50, tk.END)
+        index = self.cardholders.index(previous)
+        self.cardholders[index] = cardholder
+        self._all_cardholder_rows[index] = self._cardholder_row(cardholder)
+        self._cardholders_by_card[cardholder.card_number] = cardholder
+        self._cardholder_search_keys[index] = self._cardholder_search_key(cardholder)
+    
+    def _add_activity(self, message):
+        """Add activity to the recent activity list"""
+        # Bursts land within the same second; format the timestamp once per second
+        second = int(time.time())
+        if second != self._activity_second:
+            self._activity_second = second
+            self._activity_timestamp = time.strftime("%H:%M:%S", time.localtime(second))
+        self._activity_pending.append(f"[{self._activity_timestamp}] {message}")
+        
+        # Bursts of messages share one flush
+        if not self._activity_flush_scheduled:
+            self._activity_flush_scheduled = True
+            self.root.after_idle(self._flush_activity)
+    
+    def _flush_activity(self):
+        """Move pending activity messages into the list"""
+        self._activity_flush_scheduled = False
+        pending = self._activity_pending
+        
+        # The ring holds the tree's item ids, oldest first; evict in one call
+        overflow = len(self._activity_ring) + len(pending) - self.ACTIVITY_LIMIT
+        if overflow > 0:
+            self.activity_tree.delete(*(self._activity_ring.popleft() for _ in range(overflow)))
+        append, insert, next_message = self._activity_ring.append, self.activity_tree.insert, pending.popleft
+        while pending:
+            append(insert("", 0, values=(next_message(),)))
     
     def _update_kpi(self, title, value):
         """Update KPI card value"""
-        if title in self.kpi_cards:
+        if title in self.kpi_cards and self._kpi_cache.get(title) != value:
             self.kpi_cards[title].value_label.config(text=value)
+            self._kpi_cache[title] = value
+    
+    @staticmethod
+    def _cardholder_search_key(cardholder) -> str:
+        """Lowercased text matched by the search box; fields are NUL-separated"""
+        return "\0".join((
+            cardholder.name or "",
+            cardholder.email or "",
+            cardholder.card_number or "",
+            cardholder.department or ""
+        )).lower()
+    
+    @staticmethod
+    def _cardholder_row(cardholder) -> tuple:
+        """Treeview values for a cardholder"""
+        return (
+            cardholder.name,
+            cardholder.email,
+            cardholder.card_number,
+            cardholder.department or "",
+            "Active" if cardholder.active else "Inactive"
+        )
+    
+    def _show_cardholder_rows(self, rows: List[tuple]):
+        """Replace the rows behind the tree and show them from the top"""
+        self._cardholder_rows = rows
+        self._cardholder_first = 0
+        self.cardholders_tree.selection_set(())
+        self._render_cardholder_window()
+    
+    def _render_cardholder_window(self):
+        """Fill the tree with the rows currently in view"""
+        tree = self.cardholders_tree
+        rows = self._cardholder_rows
+        first = self._cardholder_first
+        visible = rows[first:first + self._cardholder_window]
+        shown = self._cardholder_slot_values
+        existing = len(shown)
+        
+        # Bound once; this loop runs on every scroll step
+        insert, item, end = tree.insert, tree.item, tk.END
+        for slot, values in enumerate(visible):
+            if slot >= existing:
+                insert("", end, iid=str(slot), values=values)
+            elif shown[slot] != values:
+                item(str(slot), values=values)
+        if existing > len(visible):
+            tree.delete(*(str(slot) for slot in range(len(visible), existing)))
+        self._cardholder_slot_values = visible
+        
+        # The first drawn row gives the real heading height; refit to it
+        if self._cardholder_heading_height is None and visible:
+            tree.after_idle(self._remeasure_cardholder_window)
+        
+        total = len(rows)
+        if total:
+            self._cardholders_vscroll.set(first / total, (first + len(visible)) / total)
+        else:
+            self._cardholders_vscroll.set(0, 1)
+    
+    def _move_cardholder_window(self, first: int):
+        """Scroll the row window to start at first, keeping the selection on its row"""
+        first = max(0, min(first, len(self._cardholder_rows) - self._cardholder_window))
+        shift = first - self._cardholder_first
+        if not shift:
+            return
+        
+        tree = self.cardholders_tree
+        selected = [int(iid) - shift for iid in tree.selection()]
+        self._cardholder_first = first
+        self._render_cardholder_window()
+        tree.selection_set([str(slot) for slot in selected if 0 <= slot < self._cardholder_window])
+    
+    def _scroll_cardholders(self, action, amount, unit=None):
+        """Vertical scrollbar / mouse wheel command"""
+        if action == "moveto":
+            first = round(float(amount) * len(self._cardholder_rows))
+        elif unit == "pages":
+            first = self._cardholder_first + int(amount) * self._cardholder_window
+        else:
+            first = self._cardholder_first + int(amount)
+        self._move_cardholder_window(first)
+        return "break"
+    
+    def _step_cardholder_selection(self, step: int):
+        """Arrow keys: scroll the window when the focus leaves the visible rows"""
+        tree = self.cardholders_tree
+        focus = tree.focus()
+        if not focus:
+            return None
+        slot = int(focus) + step
+        if 0 <= slot < len(self._cardholder_slot_values):
+            return None  # Let the Treeview move within the window
+        
+        self._move_cardholder_window(self._cardholder_first + step)
+        slot = min(max(slot - step, 0), len(self._cardholder_slot_values) - 1)
+        tree.selection_set(str(slot))
+        tree.focus(str(slot))
+        return "break"
+    
+    def _on_cardholders_resize(self, event):
+        """Size the row window to the tree's height"""
+        self._size_cardholder_window(event.height)
+    
+    def _size_cardholder_window(self, height: int):
+        """Fit the row window to height pixels of tree"""
+        style_height = ttk.Style().lookup("Treeview", "rowheight")
+        row_height = int(style_height) if style_height else self.DEFAULT_ROW_HEIGHT
+        # Only rows below the heading are visible
+        window = max(1, (height - self._measure_cardholder_heading(row_height)) // row_height)
+        if window != self._cardholder_window:
+            self._cardholder_window = window
+            self._cardholder_first = max(0, min(self._cardholder_first, len(self._cardholder_rows) - window))
+            self._render_cardholder_window()
+    
+    def _measure_cardholder_heading(self, row_height: int) -> int:
+        """Height above the first row, from its bbox; one row until a row is drawn"""
+        if self._cardholder_heading_height is None:
+            bbox = self.cardholders_tree.bbox("0") if self._cardholder_slot_values else ""
+            if not bbox:
+                return row_height
+            self._cardholder_heading_height = int(bbox[1])
+        return self._cardholder_heading_height
+    
+    def _remeasure_cardholder_window(self):
+        """Resize the row window once the first row can be measured"""
+        # Not drawn yet (e.g. tab hidden); the next render or resize tries again
+        if self._cardholder_heading_height is None and not (
+                self._cardholder_slot_values and self.cardholders_tree.bbox("0")):
+            return
+        self._size_cardholder_window(self.cardholders_tree.winfo_height())
     
     def _refresh_cardholders_tree(self):
         """Refresh cardholders treeview"""
-        # Clear existing items
-        for item in self.cardholders_tree.get_children():
-            self.cardholders_tree.delete(item)
-        
-        # Add cardholders
-        for cardholder in self.cardholders:
-            status = "Active" if cardholder.active else "Inactive"
-            self.cardholders_tree.insert("", tk.END, values=(
-                cardholder.name,
-                cardholder.email,
-                cardholder.card_number,
-                cardholder.department or "",
-                status
-            ))
+        # Tab not built yet; it is filled when first shown
+        if self.cardholders_tree is None:
+            return
+        
+        # Hidden tab; repaint when it is next selected
+        if self.notebook.select() != self._cardholders_tab:
+            self._cardholders_dirty = True
+            return
+        
+        self._cardholders_dirty = False
+        self._show_cardholder_rows(self._all_cardholder_rows)
     
     def run(self):
         """Run the main window"""
@@ -776,6 +1233,8 @@ class MainWindow:
             raise
         finally:
             # Cleanup
+            self._io_pool.shutdown(wait=False)
+            self._email_pool.shutdown(wait=False)
             if hasattr(self, 'script_runner'):
                 self.script_runner.cleanup()
     
@@ -820,14 +1279,30 @@ class MainWindow:
     def _add_cardholder(self):
         """Add new cardholder via dialog"""
         try:
+            # Reuse the dialog from last time with empty fields
+            if self._add_cardholder_dialog is not None:
+                for entry in self._add_cardholder_fields.values():
+                    entry.delete(0, tk.END)
+                self._add_cardholder_dialog.deiconify()
+                self._add_cardholder_dialog.grab_set()
+                self._add_cardholder_fields['name'].focus_set()
+                return
+            
             # Create dialog window
             dialog = tk.Toplevel(self.root)
             dialog.title("Add New Cardholder")
             dialog.geometry("400x300")
             dialog.grab_set()  # Make dialog modal
             
+            def hide_dialog():
+                dialog.grab_release()
+                dialog.withdraw()
+            
+            dialog.protocol("WM_DELETE_WINDOW", hide_dialog)
+            self._add_cardholder_dialog = dialog
+            
             # Create form fields
-            fields = {}
+            fields = self._add_cardholder_fields
             labels = ['Name', 'Email', 'Card Number', 'Department', 'Cost Centre', 'Manager Email']
             
             for i, label in enumerate(labels):
@@ -861,11 +1336,12 @@ class MainWindow:
                         cost_centre=fields['cost_centre'].get().strip() or None
                     )
                     
-                    # Refresh UI
-                    self._load_initial_data()
+                    # Show the new row without reloading every cardholder
+                    self._add_cardholder_locally(cardholder)
+                    self._refresh_cardholders_tree()
                     self._add_activity(f"Added new cardholder: {name}")
                     
-                    dialog.destroy()
+                    hide_dialog()
                     messagebox.showinfo("Success", f"Successfully added cardholder: {name}")
                     
                 except Exception as e:
@@ -873,7 +1349,8 @@ class MainWindow:
                     messagebox.showerror("Error", error_msg)
             
             tk.Button(button_frame, text="Save", command=save_cardholder).pack(side="left", padx=5)
-            tk.Button(button_frame, text="Cancel", command=dialog.destroy).pack(side="left", padx=5)
+            tk.Button(button_frame, text="Cancel", command=hide_dialog).pack(side="left", padx=5)
+            fields['name'].focus_set()
             
         except Exception as e:
             error_msg = f"Failed to open add cardholder dialog: {str(e)}"
@@ -887,14 +1364,14 @@ class MainWindow:
                 messagebox.showinfo("No Selection", "Please select a cardholder to edit.")
                 return
             
-            # Get selected cardholder details
-            item = selected_items[0]
-            values = self.cardholders_tree.item(item, 'values')
+            # Get selected cardholder details from the rows on screen, not via a Tcl query
+            values = self._cardholder_slot_values[int(selected_items[0])]
             cardholder_name = values[0]
             card_number = values[2]
             
-            # Find cardholder in database
-            cardholder = self.excel_handler.db_manager.get_cardholder_by_card_number(card_number)
+            # Loaded cardholders are indexed; only fall back to the database for others
+            cardholder = (self._cardholders_by_card.get(card_number)
+                          or self.excel_handler.db_manager.get_cardholder_by_card_number(card_number))
             if not cardholder:
                 messagebox.showerror("Error", "Cardholder not found in database.")
                 return
@@ -944,19 +1421,23 @@ class MainWindow:
                         return
                     
                     # Update cardholder in database
-                    with self.excel_handler.db_manager.get_session() as session:
-                        cardholder.name = name
-                        cardholder.email = email
-                        cardholder.card_number = new_card_number
-                        cardholder.department = fields['department'].get().strip() or None
-                        cardholder.cost_centre = fields['cost_centre'].get().strip() or None
-                        cardholder.manager_email = fields['manager_email'].get().strip() or None
-                        cardholder.active = active_var.get()
-                        cardholder.updated_at = datetime.utcnow()
-                        session.commit()
+                    updated = self.excel_handler.db_manager.update_cardholder(
+                        cardholder.id,
+                        name=name,
+                        email=email,
+                        card_number=new_card_number,
+                        department=fields['department'].get().strip() or None,
+                        cost_centre=fields['cost_centre'].get().strip() or None,
+                        manager_email=fields['manager_email'].get().strip() or None,
+                        active=active_var.get()
+                    )
+                    if not updated:
+                        messagebox.showerror("Error", "Cardholder not found in database.")
+                        return
                     
-                    # Refresh UI
-                    self._load_initial_data()
+                    # Update the one row instead of reloading every cardholder
+                    self._replace_cardholder_locally(card_number, updated)
+                    self._refresh_cardholders_tree()
                     self._add_activity(f"Updated cardholder: {name}")
                     
                     dialog.destroy()
@@ -982,9 +1463,8 @@ class MainWindow:
                 messagebox.showinfo("No Selection", "Please select a cardholder to delete.")
                 return
             
-            # Get selected cardholder details
-            item = selected_items[0]
-            values = self.cardholders_tree.item(item, 'values')
+            # Get selected cardholder details from the rows on screen, not via a Tcl query
+            values = self._cardholder_slot_values[int(selected_items[0])]
             cardholder_name = values[0]
             card_number = values[2]
             
@@ -993,20 +1473,31 @@ class MainWindow:
                 f"Are you sure you want to delete cardholder '{cardholder_name}'?\n\nThis action cannot be undone."):
                 return
             
-            # Find and delete from database
-            cardholder = self.excel_handler.db_manager.get_cardholder_by_card_number(card_number)
-            if cardholder:
-                with self.excel_handler.db_manager.get_session() as session:
-                    session.delete(cardholder)
-                    session.commit()
+            # Delete on the I/O pool; _on_cardholder_deleted updates the view
+            future = self._io_pool.submit(self.excel_handler.db_manager.delete_cardholder, card_number)
+            future.add_done_callback(
+                lambda f: self.post_command("_on_cardholder_deleted", card_number, cardholder_name, f)
+            )
                 
-                # Refresh UI
-                self._load_initial_data()
-                self._add_activity(f"Deleted cardholder: {cardholder_name}")
-                messagebox.showinfo("Success", f"Successfully deleted cardholder: {cardholder_name}")
-            else:
+        except Exception as e:
+            error_msg = f"Failed to delete cardholder: {str(e)}"
+            logger.error("Delete cardholder failed", exception=e)
+            self._add_activity(f"Error: {error_msg}")
+            messagebox.showerror("Delete Error", error_msg)
+    
+    def _on_cardholder_deleted(self, card_number: str, cardholder_name: str, future: Future):
+        """Apply a background delete to the view"""
+        try:
+            if not future.result():
                 messagebox.showerror("Error", "Cardholder not found in database.")
-                
+                return
+            
+            # Drop the row locally instead of reloading every cardholder
+            self._remove_cardholder_locally(card_number)
+            self._refresh_cardholders_tree()
+            self._add_activity(f"Deleted cardholder: {cardholder_name}")
+            messagebox.showinfo("Success", f"Successfully deleted cardholder: {cardholder_name}")
+            
         except Exception as e:
             error_msg = f"Failed to delete cardholder: {str(e)}"
             logger.error("Delete cardholder failed", exception=e)
@@ -1027,21 +1518,37 @@ class MainWindow:
             if not file_path:
                 return  # User cancelled
             
-            # Show progress indicator
+            # Show progress indicator; it is drawn as soon as this handler returns
             self._add_activity("Importing cardholders from Excel...")
-            self.root.update()
             
-            # Load and process the data
-            df = self.excel_handler.load_cardholder_data(file_path)
+            # Load and sync on the I/O pool; _on_cardholders_imported reports back
+            future = self._io_pool.submit(self._import_cardholders_file, file_path)
+            future.add_done_callback(
+                lambda f: self.post_command("_on_cardholders_imported", file_path, f)
+            )
             
-            # Sync with database
-            self.excel_handler._sync_cardholders(df)
+        except Exception as e:
+            error_msg = f"Failed to import cardholders: {str(e)}"
+            logger.error("Cardholder import failed", exception=e)
+            self._add_activity(f"Error: {error_msg}")
+            messagebox.showerror("Import Error", error_msg)
+    
+    def _import_cardholders_file(self, file_path: str) -> int:
+        """Load a cardholder workbook and sync it to the database; runs on the I/O pool"""
+        df = self.excel_handler.load_cardholder_data(file_path)
+        self.excel_handler._sync_cardholders(df)
+        return len(df)
+    
+    def _on_cardholders_imported(self, file_path: str, future: Future):
+        """Report a background import and reload the cardholders"""
+        try:
+            count = future.result()
             
             # Refresh the cardholder tree view
             self._load_initial_data()  # This will reload cardholders from database
             
-            self._add_activity(f"Successfully imported {len(df)} cardholders")
-            messagebox.showinfo("Success", f"Successfully imported {len(df)} cardholders from {Path(file_path).name}")
+            self._add_activity(f"Successfully imported {count} cardholders")
+            messagebox.showinfo("Success", f"Successfully imported {count} cardholders from {Path(file_path).name}")
             
         except Exception as e:
             error_msg = f"Failed to import cardholders: {str(e)}"
@@ -1070,66 +1577,85 @@ class MainWindow:
                 return  # User cancelled
             
             self._add_activity("Exporting cardholders...")
-            self.root.update()
-            
-            # Prepare data for export
-            export_data = []
-            for cardholder in self.cardholders:
-                export_data.append({
-                    'Name': cardholder.name,
-                    'Email': cardholder.email,
-                    'Card Number': cardholder.card_number,
-                    'Department': cardholder.department or '',
-                    'Cost Centre': cardholder.cost_centre or '',
-                    'Manager Email': cardholder.manager_email or '',
-                    'Active': 'Yes' if cardholder.active else 'No',
-                    'Created': cardholder.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-                    'Updated': cardholder.updated_at.strftime('%Y-%m-%d %H:%M:%S')
-                })
-            
-            df = pd.DataFrame(export_data)
-            
-            # Export based on file extension
-            if file_path.lower().endswith('.csv'):
-                df.to_csv(file_path, index=False)
-            else:
-                df.to_excel(file_path, index=False, sheet_name='Cardholders')
             
-            self._add_activity(f"Successfully exported {len(export_data)} cardholders")
-            messagebox.showinfo("Success", f"Successfully exported {len(export_data)} cardholders to {Path(file_path).name}")
+            # Build and write the file on the I/O pool from a snapshot of the list
+            future = self._io_pool.submit(self._write_cardholders_export, list(self.cardholders), file_path)
+            future.add_done_callback(
+                lambda f: self.post_command("_on_cardholders_exported", file_path, f)
+            )
             
         except Exception as e:
             error_msg = f"Failed to export cardholders: {str(e)}"
             logger.error("Cardholder export failed", exception=e)
             self._add_activity(f"Error: {error_msg}")
             messagebox.showerror("Export Error", error_msg)
-    def _filter_cardholders(self, event):
-        """Filter cardholders based on search term"""
+    
+    @staticmethod
+    def _write_cardholders_export(cardholders, file_path: str) -> int:
+        """Write cardholders to an Excel or CSV file; runs on the I/O pool"""
+        # Prepare data for export: one tuple per row, formatting done per column
+        columns = ['Name', 'Email', 'Card Number', 'Department', 'Cost Centre',
+                   'Manager Email', 'Active', 'Created', 'Updated']
+        df = pd.DataFrame.from_records(
+            ((c.name, c.email, c.card_number, c.department or '', c.cost_centre or '',
+              c.manager_email or '', c.active, c.created_at, c.updated_at)
+             for c in cardholders),
+            columns=columns
+        )
+        df['Active'] = df['Active'].astype(bool).map({True: 'Yes', False: 'No'})
+        for column in ('Created', 'Updated'):
+            df[column] = pd.to_datetime(df[column]).dt.strftime('%Y-%m-%d %H:%M:%S')
+        
+        # Export based on file extension
+        if file_path.lower().endswith('.csv'):
+            df.to_csv(file_path, index=False, chunksize=10000)
+        else:
+            # constant_memory flushes each row to disk once the next one starts,
+            # so rows are written in order here rather than via df.to_excel
+            workbook = xlsxwriter.Workbook(file_path, {'constant_memory': True})
+            try:
+                worksheet = workbook.add_worksheet('Cardholders')
+                worksheet.write_row(0, 0, columns)
+                for row_num, row in enumerate(df.fillna('').itertuples(index=False, name=None), start=1):
+                    worksheet.write_row(row_num, 0, row)
+            finally:
+                workbook.close()
+        
+        return len(df)
+    
+    def _on_cardholders_exported(self, file_path: str, future: Future):
+        """Report a background export"""
         try:
-            search_widget = event.widget
-            search_term = search_widget.get().lower().strip()
-            
-            # Clear existing items
-            for item in self.cardholders_tree.get_children():
-                self.cardholders_tree.delete(item)
+            count = future.result()
+            self._add_activity(f"Successfully exported {count} cardholders")
+            messagebox.showinfo("Success", f"Successfully exported {count} cardholders to {Path(file_path).name}")
             
-            # Add filtered cardholders
-            for cardholder in self.cardholders:
-                # Search in name, email, card number, and department
-                searchable_text = f"{cardholder.name} {cardholder.email} {cardholder.card_number} {cardholder.department or ''}".lower()
-                
-                if not search_term or search_term in searchable_text:
-                    status = "Active" if cardholder.active else "Inactive"
-                    self.cardholders_tree.insert("", tk.END, values=(
-                        cardholder.name,
-                        cardholder.email,
-                        cardholder.card_number,
-                        cardholder.department or "",
-                        status
-                    ))
-                    
         except Exception as e:
-            logger.error("Cardholder filtering failed", exception=e)
+            error_msg = f"Failed to export cardholders: {str(e)}"
+            logger.error("Cardholder export failed", exception=e)
+            self._add_activity(f"Error: {error_msg}")
+            messagebox.showerror("Export Error", error_msg)
+    def _filter_cardholders(self, event=None):
+        """Debounce search keystrokes; filter once typing pauses"""
+        if self._filter_after_id:
+            self.root.after_cancel(self._filter_after_id)
+        self._filter_after_id = self.root.after(200, self._do_filter_cardholders)
+    
+    def _do_filter_cardholders(self):
+        """Filter cardholders based on search term"""
+        self._filter_after_id = None
+        search_term = self.cardholder_search_var.get().strip()
+        
+        if not search_term:
+            self._refresh_cardholders_tree()
+            return
+        
+        # Substring match over the precomputed keys of the loaded cardholders
+        term = search_term.lower()
+        self._show_cardholder_rows([
+            row for row, key in zip(self._all_cardholder_rows, self._cardholder_search_keys)
+            if term in key
+        ])
     
     # Statement methods
     def _generate_all_statements(self): self._add_activity("Generate all statements requested")
@@ -1215,7 +1741,7 @@ class MainWindow:
                     if email:
                         recipient_lines.append(f"{name} <{email}>")
                 
-                self.recipients_text.insert("1.0", "\\n".join(recipient_lines))
+                self.recipients_text.insert("1.0", "\n".join(recipient_lines))
                 self._add_activity(f"Imported {len(recipients)} recipients from Excel")
                 messagebox.showinfo("Success", f"Imported {len(recipients)} recipients from Excel file")
             else:
@@ -1231,8 +1757,8 @@ class MainWindow:
         try:
             import pandas as pd
             
-            # Read the OUTSTANDING LOGS sheet
-            df = pd.read_excel(filepath, sheet_name="OUTSTANDING LOGS")
+            # Read the OUTSTANDING LOGS sheet; names and emails are text, so skip type inference
+            df = pd.read_excel(filepath, sheet_name="OUTSTANDING LOGS", dtype=str)
             
             # Common column mappings for cardholder data
             name_columns = ['Name', 'Full Name', 'Cardholder Name', 'FullName']
@@ -1256,24 +1782,22 @@ class MainWindow:
                 email_col = df.columns[7]  # Commonly position 8 (index 7)
             
             if name_col is not None and email_col is not None:
-                for _, row in df.iterrows():
-                    name = str(row[name_col]).strip() if pd.notna(row[name_col]) else ""
-                    email_data = str(row[email_col]).strip() if pd.notna(row[email_col]) else ""
-                    
-                    # Skip empty rows
-                    if not name or not email_data:
-                        continue
-                    
-                    # Parse email data (may contain multiple emails separated by semicolons)
-                    emails = [e.strip() for e in email_data.split(';') if e.strip()]
-                    
-                    for email in emails:
-                        # Basic email validation
-                        if '@' in email and '.' in email.split('@')[1]:
-                            recipients.append({
-                                'name': name,
-                                'email': email
-                            })
+                names = df[name_col].fillna('').str.strip()
+                email_data = df[email_col].fillna('').str.strip()
+                
+                # Skip empty rows
+                has_both = (names != '') & (email_data != '')
+                
+                # Parse email data (may contain multiple emails separated by semicolons)
+                emails = email_data[has_both].str.split(';').explode().str.strip()
+                
+                # Basic email validation
+                emails = emails[emails.str.match(_EMAIL_RE)]
+                
+                recipients = [
+                    {'name': name, 'email': email}
+                    for name, email in zip(names.loc[emails.index], emails)
+                ]
             else:
                 logger.warning(f"Could not find name or email columns in {filepath}")
                 
@@ -1301,7 +1825,7 @@ class MainWindow:
                     recipient_lines.append(f"{name} <{cardholder.email}>")
             
             if recipient_lines:
-                self.recipients_text.insert("1.0", "\\n".join(recipient_lines))
+                self.recipients_text.insert("1.0", "\n".join(recipient_lines))
                 self._add_activity(f"Added {len(recipient_lines)} cardholders as recipients")
             else:
                 messagebox.showinfo("Info", "No cardholders with valid email addresses found")
@@ -1309,6 +1833,14 @@ class MainWindow:
         except Exception as e:
             messagebox.showerror("Error", f"Failed to add cardholders: {str(e)}")
     
+    def _selected_attachments(self) -> List[str]:
+        """Attachment paths from the attachments field; reparsed only when the text changes"""
+        raw = self.attachments_var.get()
+        if raw != self._attachments_raw:
+            self._attachments = [f.strip() for f in raw.split(";") if f.strip()]
+            self._attachments_raw = raw
+        return self._attachments
+    
     def _browse_attachments(self): 
         """Browse for email attachments"""
         filetypes = [
@@ -1347,9 +1879,7 @@ class MainWindow:
             recipient = EmailRecipient(email=test_email, name="Test User")
             
             # Get attachments
-            attachments = []
-            if self.attachments_var.get():
-                attachments = [f.strip() for f in self.attachments_var.get().split(";") if f.strip()]
+            attachments = self._selected_attachments()
             
             # Send test email
             job_id = self.email_handler.create_bulk_job(
@@ -1376,75 +1906,78 @@ class MainWindow:
                 messagebox.showwarning("Warning", "Subject, body, and recipients are required")
                 return
             
-            # Parse recipients
-            recipients = []
-            for line in recipients_text.split("\\n"):
-                line = line.strip()
-                if not line:
-                    continue
-                
-                # Parse "Name <email>" format
-                if '<' in line and '>' in line:
-                    name = line.split('<')[0].strip()
-                    email = line.split('<')[1].split('>')[0].strip()
-                else:
-                    # Just email
-                    name = ""
-                    email = line.strip()
-                
-                if email and '@' in email:
-                    recipients.append(EmailRecipient(email=email, name=name))
+            recipients, rejected = _parse_recipient_lines(recipients_text)
             
             if not recipients:
                 messagebox.showwarning("Warning", "No valid email recipients found")
                 return
             
-            # Confirm bulk send
+            # Confirm bulk send, listing any lines that will be skipped
+            skipped = ""
+            if rejected:
+                shown = "\n".join(rejected[:5])
+                more = f"\n... and {len(rejected) - 5} more" if len(rejected) > 5 else ""
+                skipped = f"\n\n{len(rejected)} line(s) could not be read and will be skipped:\n{shown}{more}"
             result = messagebox.askyesno(
                 "Confirm Bulk Email",
-                f"Send email to {len(recipients)} recipient(s)?\\n\\nSubject: {subject}"
+                f"Send email to {len(recipients)} recipient(s)?\n\nSubject: {subject}{skipped}"
             )
             
             if not result:
                 return
             
             # Get attachments
-            attachments = []
-            if self.attachments_var.get():
-                attachments = [f.strip() for f in self.attachments_var.get().split(";") if f.strip()]
-            
-            # Send bulk email
-            job_id = self.email_handler.create_bulk_job(
-                "bulk_template",
-                recipients,
-                attachments=attachments
-            )
+            attachments = self._selected_attachments()
+            
+            # One job per chunk on the email workers; _on_bulk_email_sent tallies them
+            template = EmailTemplate("bulk_template", subject, body)
+            chunk_size = self.BULK_EMAIL_CHUNK_SIZE
+            chunks = [recipients[i:i + chunk_size] for i in range(0, len(recipients), chunk_size)]
+            batch = {'pending': len(chunks), 'success_count': 0, 'failed_count': 0}
+            
+            for chunk in chunks:
+                job_id = self.email_handler.create_bulk_job(
+                    "bulk_template",
+                    chunk,
+                    attachments=attachments,
+                    template=template
+                )
+                future = self._email_pool.submit(self.email_handler.execute_bulk_job, job_id)
+                future.add_done_callback(
+                    lambda f, count=len(chunk): self.post_command("_on_bulk_email_sent", batch, count, f)
+                )
             
-            self._add_activity(f"Bulk email sent to {len(recipients)} recipients")
-            messagebox.showinfo("Success", f"Bulk email job created for {len(recipients)} recipients!")
+            self._add_activity(f"Sending bulk email to {len(recipients)} recipients...")
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to send bulk email: {str(e)}")
     
-    def _preview_email_variables(self): 
-        """Preview available email variables"""
-        variables_text = """Available Variables:
+    def _on_bulk_email_sent(self, batch: Dict[str, int], count: int, future: Future):
+        """Tally one finished bulk email chunk and report once the whole send is done"""
+        batch['pending'] -= 1
+        try:
+            results = future.result()
+            batch['success_count'] += results['success_count']
+            # Recipients skipped by an aborted chunk count as failed
+            batch['failed_count'] += count - results['success_count']
+        except Exception as e:
+            logger.error("Bulk email chunk failed", exception=e)
+            self._add_activity(f"Error: Failed to send bulk email chunk: {str(e)}")
+            batch['failed_count'] += count
         
-{name} - Recipient name
-{email} - Recipient email
-{card_number} - Card number (last 4 digits)
-{department} - Department
-{manager_email} - Manager email
-{today} - Current date
-{month} - Current month
-{year} - Current year
-{amount} - Transaction amount
-{currency} - Currency code
-
-Usage: Include variables in subject or body using {variable_name} format.
-Example: "Dear {name}, your card ending in {card_last4} has..."
-        """
+        summary = f"{batch['success_count']} sent, {batch['failed_count']} failed"
+        if batch['pending']:
+            self._add_activity(f"Bulk email progress: {summary}")
+            return
         
+        self._add_activity(f"Bulk email finished: {summary}")
+        if not batch['failed_count']:
+            messagebox.showinfo("Success", f"Bulk email sent to {batch['success_count']} recipients!")
+        else:
+            messagebox.showwarning("Bulk Email", f"Bulk email finished: {summary}")
+    
+    def _preview_email_variables(self): 
+        """Preview available email variables"""
         # Show in popup window
         popup = tk.Toplevel(self.root)
         popup.title("Email Variables")
@@ -1453,7 +1986,7 @@ Example: "Dear {name}, your card ending in {card_last4} has..."
         
         text_widget = scrolledtext.ScrolledText(popup, wrap=tk.WORD)
         text_widget.pack(fill="both", expand=True, padx=10, pady=10)
-        text_widget.insert("1.0", variables_text)
+        text_widget.insert("1.0", _EMAIL_VARIABLES_HELP)
         text_widget.configure(state="disabled")
         
         ttk.Button(popup, text="Close", command=popup.destroy).pack(pady=10)
@@ -1463,19 +1996,10 @@ Example: "Dear {name}, your card ending in {card_last4} has..."
         try:
             templates = self.email_handler.list_templates()
             
-            # Update combobox
-            if hasattr(self, 'template_var'):
-                template_combo = None
-                # Find the combobox widget - this is a simplified approach
-                # In real implementation, we'd store a reference to it
-                for widget in self.root.winfo_children():
-                    if isinstance(widget, ttk.Combobox):
-                        template_combo = widget
-                        break
-                
-                if template_combo:
-                    template_combo['values'] = templates
-                    
+            # Update combobox; it exists once the Email tab has been built
+            if self.template_combo is not None:
+                self.template_combo['values'] = templates
+            
             self._add_activity("Email templates refreshed")
             
         except Exception as e:
@@ -1490,17 +2014,11 @@ Example: "Dear {name}, your card ending in {card_last4} has..."
             return
         
         try:
-            # Get selected script info
-            item = selection[0]
-            script_name = self.scripts_tree.item(item)['values'][0]
+            # Get selected script info; rows are keyed by script name
+            script_name = selection[0]
             
             # Find the script
-            scripts = self.script_runner.list_scripts()
-            selected_script = None
-            for script in scripts:
-                if script.name == script_name:
-                    selected_script = script
-                    break
+            selected_script = self._scripts_by_name.get(script_name)
             
             if not selected_script:
                 messagebox.showerror("Error", f"Script '{script_name}' not found")
@@ -1516,7 +2034,7 @@ Example: "Dear {name}, your card ending in {card_last4} has..."
                     output_callback=self._script_output_callback
                 )
                 self._add_activity(f"Started script: {script_name}")
-                self.script_output_text.insert(tk.END, f"\\n=== Started {script_name} ===\\n")
+                self._append_script_output(f"\n=== Started {script_name} ===\n")
                 self.script_output_text.see(tk.END)
         
         except Exception as e:
@@ -1526,247 +2044,259 @@ Example: "Dear {name}, your card ending in {card_last4} has..."
         """Run a virtual/generated script"""
         try:
             self._add_activity(f"Running virtual script: {script_info.name}")
-            self.script_output_text.insert(tk.END, f"\\n=== Running {script_info.name} ===\\n")
+            self._append_script_output(f"\n=== Running {script_info.name} ===\n")
             
             # Simulate script functionality based on category
             if script_info.category == "finance":
-                self._simulate_finance_script(script_info)
+                steps = self._simulate_finance_script(script_info)
             elif script_info.category == "analytics":
-                self._simulate_analytics_script(script_info)
+                steps = self._simulate_analytics_script(script_info)
             elif script_info.category == "admin":
-                self._simulate_admin_script(script_info)
+                steps = self._simulate_admin_script(script_info)
             elif script_info.category == "automation":
-                self._simulate_automation_script(script_info)
+                steps = self._simulate_automation_script(script_info)
             elif script_info.category == "reporting":
-                self._simulate_reporting_script(script_info)
+                steps = self._simulate_reporting_script(script_info)
             else:
-                self._simulate_generic_script(script_info)
+                steps = self._simulate_generic_script(script_info)
             
-            self.script_output_text.insert(tk.END, f"\\n=== {script_info.name} completed successfully ===\\n")
-            self.script_output_text.see(tk.END)
+            self._run_simulation_steps(steps, script_info)
             
         except Exception as e:
-            self.script_output_text.insert(tk.END, f"\\n=== ERROR: {str(e)} ===\\n")
+            self._append_script_output(f"\n=== ERROR: {str(e)} ===\n")
             self.script_output_text.see(tk.END)
     
+    def _run_simulation_steps(self, steps, script_info):
+        """Append simulated output up to the next pause, then resume from an after() timer"""
+        # Lines between pauses go into the widget as one insert
+        lines = []
+        try:
+            for step in steps:
+                if isinstance(step, int):
+                    # Let the event loop run during the pause instead of sleeping
+                    if lines:
+                        self._append_script_output("".join(lines))
+                        self.script_output_text.see(tk.END)
+                    self.root.after(step, self._run_simulation_steps, steps, script_info)
+                    return
+                lines.append(step)
+            
+            lines.append(f"\n=== {script_info.name} completed successfully ===\n")
+        except Exception as e:
+            lines.append(f"\n=== ERROR: {str(e)} ===\n")
+        self._append_script_output("".join(lines))
+        self.script_output_text.see(tk.END)
+    
     def _simulate_finance_script(self, script_info):
-        """Simulate finance script execution"""
-        import random
-        import time
-        
-        self.script_output_text.insert(tk.END, f"Initializing {script_info.description}...\\n")
-        self.root.update()
-        time.sleep(0.5)
+        """Simulated finance script; yields output text and pauses in ms"""
+        yield f"Initializing {script_info.description}...\n"
+        yield 500
         
         if "reconcile" in script_info.name.lower():
-            self.script_output_text.insert(tk.END, "Loading purchase card transactions...\\n")
-            self.root.update()
-            time.sleep(0.3)
-            self.script_output_text.insert(tk.END, f"Found {random.randint(150, 300)} transactions\\n")
-            self.script_output_text.insert(tk.END, "Matching with bank statements...\\n")
-            self.root.update()
-            time.sleep(0.5)
+            yield "Loading purchase card transactions...\n"
+            yield 300
+            yield f"Found {random.randint(150, 300)} transactions\n"
+            yield "Matching with bank statements...\n"
+            yield 500
             matched = random.randint(140, 290)
-            self.script_output_text.insert(tk.END, f"Matched {matched} transactions\\n")
+            yield f"Matched {matched} transactions\n"
             unmatched = random.randint(0, 10)
             if unmatched > 0:
-                self.script_output_text.insert(tk.END, f"WARNING: {unmatched} unmatched transactions found\\n")
+                yield f"WARNING: {unmatched} unmatched transactions found\n"
         
         elif "budget" in script_info.name.lower():
-            self.script_output_text.insert(tk.END, "Loading budget data...\\n")
-            self.root.update()
-            time.sleep(0.3)
+            yield "Loading budget data...\n"
+            yield 300
             departments = ['Finance', 'HR', 'IT', 'Operations', 'Marketing']
-            for dept in departments:
-                budget = random.randint(50000, 200000)
-                actual = random.randint(40000, 180000)
-                variance = ((actual - budget) / budget) * 100
-                self.script_output_text.insert(tk.END, f"{dept}: Budget £{budget:,}, Actual £{actual:,}, Variance {variance:+.1f}%\\n")
-                self.root.update()
-                time.sleep(0.2)
+            budgets = random.choices(range(50000, 200001), k=len(departments))
+            actuals = random.choices(range(40000, 180001), k=len(departments))
+            yield "".join(
+                f"{dept}: Budget £{budget:,}, Actual £{actual:,}, "
+                f"Variance {(actual - budget) / budget * 100:+.1f}%\n"
+                for dept, budget, actual in zip(departments, budgets, actuals)
+            )
         
         elif "fraud" in script_info.name.lower():
-            self.script_output_text.insert(tk.END, "Analyzing transaction patterns...\\n")
-            self.root.update()
-            time.sleep(0.8)
+            yield "Analyzing transaction patterns...\n"
+            yield 800
             total_transactions = random.randint(1000, 2000)
             flagged = random.randint(2, 15)
-            self.script_output_text.insert(tk.END, f"Analyzed {total_transactions} transactions\\n")
-            self.script_output_text.insert(tk.END, f"Flagged {flagged} potentially fraudulent transactions\\n")
+            yield f"Analyzed {total_transactions} transactions\n"
+            yield f"Flagged {flagged} potentially fraudulent transactions\n"
             if flagged > 0:
-                self.script_output_text.insert(tk.END, "Fraud detection report generated: fraud_report.xlsx\\n")
+                yield "Fraud detection report generated: fraud_report.xlsx\n"
         
         else:
             # Generic finance simulation
-            self.script_output_text.insert(tk.END, "Processing financial data...\\n")
-            self.root.update()
-            time.sleep(0.5)
-            self.script_output_text.insert(tk.END, f"Processed {random.randint(50, 500)} records\\n")
-            self.script_output_text.insert(tk.END, f"Generated report: {script_info.name}_report_{datetime.now().strftime('%Y%m%d')}.xlsx\\n")
+            yield "Processing financial data...\n"
+            yield 500
+            yield f"Processed {random.randint(50, 500)} records\n"
+            yield f"Generated report: {script_info.name}_report_{datetime.now().strftime('%Y%m%d')}.xlsx\n"
     
     def _simulate_analytics_script(self, script_info):
-        """Simulate analytics script execution"""
-        import random
-        import time
-        
-        self.script_output_text.insert(tk.END, f"Starting analytics: {script_info.description}...\\n")
-        self.root.update()
-        time.sleep(0.3)
+        """Simulated analytics script; yields output text and pauses in ms"""
+        yield f"Starting analytics: {script_info.description}...\n"
+        yield 300
         
         if "predictive" in script_info.name.lower():
-            self.script_output_text.insert(tk.END, "Loading historical data...\\n")
-            self.root.update()
-            time.sleep(0.5)
-            self.script_output_text.insert(tk.END, "Training predictive model...\\n")
-            self.root.update()
-            time.sleep(1.0)
+            yield "Loading historical data...\n"
+            yield 500
+            yield "Training predictive model...\n"
+            yield 1000
             accuracy = random.uniform(0.82, 0.95)
-            self.script_output_text.insert(tk.END, f"Model trained with {accuracy:.2%} accuracy\\n")
-            self.script_output_text.insert(tk.END, "Generating predictions...\\n")
-            time.sleep(0.5)
+            yield f"Model trained with {accuracy:.2%} accuracy\n"
+            yield "Generating predictions...\n"
+            yield 500
             predictions = random.randint(10, 50)
-            self.script_output_text.insert(tk.END, f"Generated {predictions} predictions\\n")
+            yield f"Generated {predictions} predictions\n"
         
         elif "correlation" in script_info.name.lower():
-            self.script_output_text.insert(tk.END, "Calculating correlation matrix...\\n")
-            self.root.update()
-            time.sleep(0.7)
+            yield "Calculating correlation matrix...\n"
+            yield 700
             variables = ['Spending', 'Department Size', 'Month', 'Vendor Rating', 'Approval Time']
-            for i, var1 in enumerate(variables):
-                for var2 in variables[i+1:]:
-                    corr = random.uniform(-0.8, 0.8)
-                    self.script_output_text.insert(tk.END, f"{var1} vs {var2}: {corr:+.3f}\\n")
-                    self.root.update()
-                    time.sleep(0.1)
+            yield "".join(
+                f"{var1} vs {var2}: {random.uniform(-0.8, 0.8):+.3f}\n"
+                for var1, var2 in combinations(variables, 2)
+            )
         
         else:
             # Generic analytics simulation
-            self.script_output_text.insert(tk.END, "Analyzing data patterns...\\n")
-            self.root.update()
-            time.sleep(0.8)
+            yield "Analyzing data patterns...\n"
+            yield 800
             insights = random.randint(5, 15)
-            self.script_output_text.insert(tk.END, f"Generated {insights} key insights\\n")
-            self.script_output_text.insert(tk.END, "Analytics report saved to analytics_output.xlsx\\n")
+            yield f"Generated {insights} key insights\n"
+            yield "Analytics report saved to analytics_output.xlsx\n"
     
     def _simulate_admin_script(self, script_info):
-        """Simulate admin script execution"""
-        import random
-        import time
-        
-        self.script_output_text.insert(tk.END, f"Running system task: {script_info.description}...\\n")
-        self.root.update()
-        time.sleep(0.3)
+        """Simulated admin script; yields output text and pauses in ms"""
+        yield f"Running system task: {script_info.description}...\n"
+        yield 300
         
         if "health" in script_info.name.lower():
             components = ['Database', 'Email Service', 'File System', 'Network', 'CPU', 'Memory']
-            for component in components:
-                status = random.choice(['OK', 'OK', 'OK', 'WARNING', 'OK'])
-                value = random.randint(10, 95)
-                self.script_output_text.insert(tk.END, f"{component}: {status} ({value}% utilization)\\n")
-                self.root.update()
-                time.sleep(0.2)
+            statuses = random.choices(['OK', 'OK', 'OK', 'WARNING', 'OK'], k=len(components))
+            values = random.choices(range(10, 96), k=len(components))
+            yield "".join(
+                f"{component}: {status} ({value}% utilization)\n"
+                for component, status, value in zip(components, statuses, values)
+            )
         
         elif "backup" in script_info.name.lower():
-            self.script_output_text.insert(tk.END, "Validating backup integrity...\\n")
-            self.root.update()
-            time.sleep(0.8)
+            yield "Validating backup integrity...\n"
+            yield 800
             files = random.randint(1000, 5000)
-            self.script_output_text.insert(tk.END, f"Verified {files} files\\n")
+            yield f"Verified {files} files\n"
             corrupted = random.randint(0, 2)
             if corrupted > 0:
-                self.script_output_text.insert(tk.END, f"WARNING: {corrupted} corrupted files detected\\n")
+                yield f"WARNING: {corrupted} corrupted files detected\n"
             else:
-                self.script_output_text.insert(tk.END, "All backup files validated successfully\\n")
+                yield "All backup files validated successfully\n"
         
         else:
             # Generic admin simulation
-            self.script_output_text.insert(tk.END, "Performing system maintenance...\\n")
-            self.root.update()
-            time.sleep(0.6)
-            self.script_output_text.insert(tk.END, "System maintenance completed\\n")
+            yield "Performing system maintenance...\n"
+            yield 600
+            yield "System maintenance completed\n"
     
     def _simulate_automation_script(self, script_info):
-        """Simulate automation script execution"""
-        import random
-        import time
-        
-        self.script_output_text.insert(tk.END, f"Automating: {script_info.description}...\\n")
-        self.root.update()
-        time.sleep(0.2)
+        """Simulated automation script; yields output text and pauses in ms"""
+        yield f"Automating: {script_info.description}...\n"
+        yield 200
         
         if "workflow" in script_info.name.lower():
             steps = ['Validation', 'Processing', 'Approval Routing', 'Notification', 'Archive']
             for i, step in enumerate(steps, 1):
-                self.script_output_text.insert(tk.END, f"Step {i}: {step}...\\n")
-                self.root.update()
-                time.sleep(0.4)
+                yield f"Step {i}: {step}...\n"
+                yield 400
                 status = random.choice(['✓ Complete', '✓ Complete', '✓ Complete', '⚠ Warning'])
-                self.script_output_text.insert(tk.END, f"  {status}\\n")
+                yield f"  {status}\n"
         
         elif "email" in script_info.name.lower():
             recipients = random.randint(20, 100)
-            self.script_output_text.insert(tk.END, f"Sending automated emails to {recipients} recipients...\\n")
-            self.root.update()
-            time.sleep(0.8)
+            yield f"Sending automated emails to {recipients} recipients...\n"
+            yield 800
             sent = random.randint(recipients - 5, recipients)
             failed = recipients - sent
-            self.script_output_text.insert(tk.END, f"Successfully sent: {sent}\\n")
+            yield f"Successfully sent: {sent}\n"
             if failed > 0:
-                self.script_output_text.insert(tk.END, f"Failed to send: {failed}\\n")
+                yield f"Failed to send: {failed}\n"
         
         else:
             # Generic automation simulation
             tasks = random.randint(10, 50)
-            self.script_output_text.insert(tk.END, f"Processing {tasks} automated tasks...\\n")
-            self.root.update()
-            time.sleep(0.7)
+            yield f"Processing {tasks} automated tasks...\n"
+            yield 700
             completed = random.randint(tasks - 3, tasks)
-            self.script_output_text.insert(tk.END, f"Completed {completed}/{tasks} tasks\\n")
+            yield f"Completed {completed}/{tasks} tasks\n"
     
     def _simulate_reporting_script(self, script_info):
-        """Simulate reporting script execution"""
-        import random
-        import time
-        
-        self.script_output_text.insert(tk.END, f"Generating report: {script_info.description}...\\n")
-        self.root.update()
-        time.sleep(0.3)
+        """Simulated reporting script; yields output text and pauses in ms"""
+        yield f"Generating report: {script_info.description}...\n"
+        yield 300
         
-        self.script_output_text.insert(tk.END, "Collecting data sources...\\n")
-        time.sleep(0.4)
+        yield "Collecting data sources...\n"
+        yield 400
         
         sources = ['Transactions DB', 'User Directory', 'Approval Logs', 'Email Statistics']
         for source in sources:
             records = random.randint(100, 2000)
-            self.script_output_text.insert(tk.END, f"  {source}: {records:,} records\\n")
-            self.root.update()
-            time.sleep(0.2)
+            yield f"  {source}: {records:,} records\n"
+            yield 200
         
-        self.script_output_text.insert(tk.END, "Processing and formatting...\\n")
-        time.sleep(0.6)
+        yield "Processing and formatting...\n"
+        yield 600
         
         filename = f"{script_info.name.replace('_', ' ').title()} Report {datetime.now().strftime('%Y-%m-%d')}.xlsx"
-        self.script_output_text.insert(tk.END, f"Report generated: {filename}\\n")
+        yield f"Report generated: {filename}\n"
         
         if "executive" in script_info.name.lower():
-            self.script_output_text.insert(tk.END, "Sending to executive stakeholders...\\n")
-            time.sleep(0.3)
-            self.script_output_text.insert(tk.END, "Executive dashboard updated\\n")
+            yield "Sending to executive stakeholders...\n"
+            yield 300
+            yield "Executive dashboard updated\n"
     
     def _simulate_generic_script(self, script_info):
-        """Simulate generic script execution"""
-        import time
-        
-        self.script_output_text.insert(tk.END, f"Executing: {script_info.description}...\\n")
-        self.root.update()
-        time.sleep(0.5)
-        self.script_output_text.insert(tk.END, "Script execution completed\\n")
+        """Simulated generic script; yields output text and pauses in ms"""
+        yield f"Executing: {script_info.description}...\n"
+        yield 500
+        yield "Script execution completed\n"
+    
+    def _append_script_output(self, text):
+        """Append to the script output pane, dropping the oldest lines past the cap"""
+        widget = self.script_output_text
+        widget.insert(tk.END, text)
+        
+        line_count = int(widget.index("end-1c").split(".")[0])
+        if line_count > self.SCRIPT_OUTPUT_MAX_LINES:
+            widget.delete("1.0", f"{line_count - self.SCRIPT_OUTPUT_MAX_LINES + 1}.0")
     
     def _script_output_callback(self, output):
-        """Callback for script output"""
-        self.script_output_text.insert(tk.END, output)
-        self.script_output_text.see(tk.END)
-        self.root.update()
+        """Callback for script output; runs on the runner's output thread"""
+        self._script_output_pending.append(output)
+        if not self._script_output_flush_pending:
+            self._script_output_flush_pending = True
+            self.post_command("_flush_script_output")
+    
+    def _flush_script_output(self):
+        """Write every queued script output line with a single insert"""
+        # Chatty scripts are throttled; lines keep queueing until the gap has passed
+        wait_ms = self.SCRIPT_OUTPUT_FLUSH_MS - int((time.monotonic() - self._script_output_flushed_at) * 1000)
+        if wait_ms > 0:
+            self.root.after(wait_ms, self._flush_script_output)
+            return
+        
+        self._script_output_flushed_at = time.monotonic()
+        self._script_output_flush_pending = False
+        pending = self._script_output_pending
+        lines = []
+        try:
+            while True:
+                lines.append(pending.popleft())
+        except IndexError:
+            pass
+        
+        if lines:
+            self._append_script_output("\n".join(lines) + "\n")
+            self.script_output_text.see(tk.END)
     
     def _stop_selected_script(self): 
         """Stop the selected running script"""
@@ -1776,55 +2306,73 @@ Example: "Dear {name}, your card ending in {card_last4} has..."
             return
         
         try:
-            item = selection[0]
-            script_name = self.running_scripts_tree.item(item)['values'][0]
+            # Rows are keyed by execution id, so concurrent runs of one script stay apart
+            execution_id = selection[0]
+            script_info = self._running_by_id.get(execution_id)
+            if script_info is None:
+                messagebox.showwarning("Warning", "Selected script is no longer running")
+                return
             
-            # Find and stop the execution
-            running_scripts = self.script_runner.get_running_scripts()
-            for script_info in running_scripts:
-                if script_info['script_name'] == script_name:
-                    success = self.script_runner.stop_script(script_info['execution_id'])
-                    if success:
-                        self._add_activity(f"Stopped script: {script_name}")
-                        self.script_output_text.insert(tk.END, f"\\n=== Stopped {script_name} ===\\n")
-                    else:
-                        messagebox.showerror("Error", f"Failed to stop script: {script_name}")
-                    break
+            script_name = script_info['script_name']
+            if self.script_runner.stop_script(execution_id):
+                self._add_activity(f"Stopped script: {script_name}")
+                self._append_script_output(f"\n=== Stopped {script_name} ===\n")
             else:
-                messagebox.showwarning("Warning", f"Running script '{script_name}' not found")
+                messagebox.showerror("Error", f"Failed to stop script: {script_name}")
         
         except Exception as e:
             messagebox.showerror("Error", f"Failed to stop script: {str(e)}")
     def _refresh_scripts_list(self): 
-        # Clear existing
-        for item in self.scripts_tree.get_children():
-            self.scripts_tree.delete(item)
-        
-        # Add scripts
-        scripts = self.script_runner.list_scripts()
-        for script in scripts:
-            self.scripts_tree.insert("", tk.END, values=(
-                script.name,
-                script.category,
-                script.description
-            ))
-    
-    def _update_running_scripts_tree(self):
-        """Update running scripts treeview"""
-        # Clear existing
-        for item in self.running_scripts_tree.get_children():
-            self.running_scripts_tree.delete(item)
-        
-        # Add running scripts
-        running_scripts = self.script_runner.get_running_scripts()
-        for script_info in running_scripts:
+        """Sync the scripts tree with the runner, touching only rows that changed"""
+        self._scripts_by_name = {script.name: script for script in self.script_runner.list_scripts()}
+        rows = {name: (name, script.category, script.description)
+                for name, script in self._scripts_by_name.items()}
+        
+        # Drop scripts that are no longer registered
+        removed = [name for name in self._script_rows if name not in rows]
+        if removed:
+            self.scripts_tree.delete(*removed)
+        
+        insert, item, previous = self.scripts_tree.insert, self.scripts_tree.item, self._script_rows
+        for index, (name, values) in enumerate(rows.items()):
+            shown = previous.get(name)
+            if shown is None:
+                insert("", index, iid=name, values=values)
+            elif shown != values:
+                item(name, values=values)
+        self._script_rows = rows
+    
+    def _update_running_scripts_tree(self, running_scripts=None):
+        """Update running scripts treeview, touching only rows that changed"""
+        # Tab not built yet
+        if self.running_scripts_tree is None:
+            return
+        
+        if running_scripts is None:
+            running_scripts = self.script_runner.get_running_scripts()
+        
+        current = {script_info['execution_id']: script_info for script_info in running_scripts}
+        
+        # Drop finished scripts
+        finished = [execution_id for execution_id in self._running_by_id if execution_id not in current]
+        if finished:
+            self.running_scripts_tree.delete(*finished)
+        
+        # Add new scripts; for the rest only the runtime changes
+        insert, set_cell = self.running_scripts_tree.insert, self.running_scripts_tree.set
+        for execution_id, script_info in current.items():
             runtime = f"{script_info['runtime_seconds']:.1f}s"
-            self.running_scripts_tree.insert("", tk.END, values=(
-                script_info['script_name'],
-                "Running",
-                runtime,
-                script_info.get('pid', 'N/A')
-            ))
+            if execution_id not in self._running_by_id:
+                pid = script_info['pid']
+                insert("", tk.END, iid=execution_id, values=(
+                    script_info['script_name'],
+                    "Running",
+                    runtime,
+                    pid if pid is not None else 'N/A'
+                ))
+            else:
+                set_cell(execution_id, "Runtime", runtime)
+        self._running_by_id = current
     
     # Analytics methods
     def _generate_chart(self): 
@@ -1833,45 +2381,50 @@ Example: "Dear {name}, your card ending in {card_last4} has..."
             return
         
         chart_type = self.chart_type_var.get()
+        
+        # Same chart over unchanged data is already on screen
+        data = self._chart_data(chart_type)
+        chart_key = (chart_type, tuple(data.items()))
+        if chart_key == self._chart_key:
+            self._add_activity(f"Chart '{chart_type}' is up to date")
+            return
+        
         self._add_activity(f"Generating {chart_type} chart...")
         
         try:
-            # Clear existing chart
-            if self.chart_canvas:
-                self.chart_canvas.get_tk_widget().destroy()
-                self.chart_canvas = None
-            
             # Generate chart based on type
             if chart_type == "transactions_by_month":
-                self._generate_transactions_by_month_chart()
+                self._generate_transactions_by_month_chart(data)
             elif chart_type == "spending_by_cardholder":
-                self._generate_spending_by_cardholder_chart()
+                self._generate_spending_by_cardholder_chart(data)
             elif chart_type == "category_breakdown":
-                self._generate_category_breakdown_chart()
+                self._generate_category_breakdown_chart(data)
             elif chart_type == "monthly_trends":
-                self._generate_monthly_trends_chart()
+                self._generate_monthly_trends_chart(data)
             elif chart_type == "email_statistics":
-                self._generate_email_statistics_chart()
+                self._generate_email_statistics_chart(data)
             else:
                 self._generate_sample_chart(chart_type)
                 
+            self._chart_key = chart_key
             self._add_activity(f"Chart '{chart_type}' generated successfully")
         except Exception as e:
+            self._chart_key = None
             self._add_activity(f"Chart generation failed: {str(e)}")
             messagebox.showerror("Chart Error", f"Failed to generate chart: {str(e)}")
     
-    def _generate_transactions_by_month_chart(self):
+    def _chart_data(self, chart_type: str) -> Dict[str, tuple]:
+        """Series plotted by a chart type; sample data until charts read the database"""
+        return _CHART_SAMPLE_DATA.get(chart_type, {})
+    
+    def _generate_transactions_by_month_chart(self, data):
         """Generate transactions by month chart"""
-        import matplotlib.pyplot as plt
-        from datetime import datetime, timedelta
-        import numpy as np
-        
-        # Sample data - in real implementation, get from database
-        months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun']
-        transactions = [245, 312, 189, 387, 423, 301]
-        amounts = [12500, 18750, 9500, 22300, 28900, 15600]
+        months = data['months']
+        transactions = data['transactions']
+        amounts = data['amounts']
         
-        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10, 8))
+        fig = self._new_chart_figure()
+        ax1, ax2 = fig.subplots(2, 1)
         fig.suptitle('Purchase Card Transactions by Month', fontsize=16, fontweight='bold')
         
         # Transaction count
@@ -1881,10 +2434,7 @@ Example: "Dear {name}, your card ending in {card_last4} has..."
         ax1.grid(axis='y', alpha=0.3)
         
         # Add value labels on bars
-        for bar in bars1:
-            height = bar.get_height()
-            ax1.text(bar.get_x() + bar.get_width()/2., height,
-                    f'{int(height)}', ha='center', va='bottom')
+        ax1.bar_label(bars1, fmt='{:.0f}')
         
         # Transaction amounts
         bars2 = ax2.bar(months, amounts, color='#28a745', alpha=0.8)
@@ -1894,24 +2444,19 @@ Example: "Dear {name}, your card ending in {card_last4} has..."
         ax2.grid(axis='y', alpha=0.3)
         
         # Add value labels on bars
-        for bar in bars2:
-            height = bar.get_height()
-            ax2.text(bar.get_x() + bar.get_width()/2., height,
-                    f'£{int(height):,}', ha='center', va='bottom')
+        ax2.bar_label(bars2, fmt='£{:,.0f}')
         
-        plt.tight_layout()
+        fig.tight_layout()
         self._display_chart(fig)
     
-    def _generate_spending_by_cardholder_chart(self):
+    def _generate_spending_by_cardholder_chart(self, data):
         """Generate spending by cardholder chart"""
-        import matplotlib.pyplot as plt
-        
-        # Sample data
-        cardholders = ['John Smith', 'Sarah Jones', 'Mike Wilson', 'Lisa Brown', 'David Lee']
-        spending = [2850, 4200, 1950, 3100, 2600]
+        cardholders = data['cardholders']
+        spending = data['spending']
         colors = ['#0078d4', '#28a745', '#ffc107', '#dc3545', '#6f42c1']
         
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+        fig = self._new_chart_figure()
+        ax1, ax2 = fig.subplots(1, 2)
         fig.suptitle('Spending by Cardholder', fontsize=16, fontweight='bold')
         
         # Bar chart
@@ -1921,28 +2466,23 @@ Example: "Dear {name}, your card ending in {card_last4} has..."
         ax1.grid(axis='x', alpha=0.3)
         
         # Add value labels
-        for bar in bars:
-            width = bar.get_width()
-            ax1.text(width, bar.get_y() + bar.get_height()/2.,
-                    f'£{int(width):,}', ha='left', va='center', fontweight='bold')
+        ax1.bar_label(bars, fmt='£{:,.0f}', fontweight='bold')
         
         # Pie chart
         ax2.pie(spending, labels=cardholders, colors=colors, autopct='%1.1f%%', startangle=90)
         ax2.set_title('Spending Distribution')
         
-        plt.tight_layout()
+        fig.tight_layout()
         self._display_chart(fig)
     
-    def _generate_category_breakdown_chart(self):
+    def _generate_category_breakdown_chart(self, data):
         """Generate category breakdown chart"""
-        import matplotlib.pyplot as plt
-        
-        # Sample data
-        categories = ['Travel', 'Office Supplies', 'IT Equipment', 'Catering', 'Training', 'Other']
-        amounts = [8500, 3200, 12000, 2100, 4800, 1900]
+        categories = data['categories']
+        amounts = data['amounts']
         colors = ['#ff6b6b', '#4ecdc4', '#45b7d1', '#96ceb4', '#feca57', '#ff9ff3']
         
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+        fig = self._new_chart_figure()
+        ax1, ax2 = fig.subplots(1, 2)
         fig.suptitle('Spending by Category', fontsize=16, fontweight='bold')
         
         # Bar chart
@@ -1953,10 +2493,7 @@ Example: "Dear {name}, your card ending in {card_last4} has..."
         ax1.grid(axis='y', alpha=0.3)
         
         # Add value labels
-        for bar in bars:
-            height = bar.get_height()
-            ax1.text(bar.get_x() + bar.get_width()/2., height,
-                    f'£{int(height):,}', ha='center', va='bottom', fontweight='bold')
+        ax1.bar_label(bars, fmt='£{:,.0f}', fontweight='bold')
         
         # Pie chart
         wedges, texts, autotexts = ax2.pie(amounts, labels=categories, colors=colors, autopct='%1.1f%%', startangle=90)
@@ -1967,21 +2504,17 @@ Example: "Dear {name}, your card ending in {card_last4} has..."
             autotext.set_color('white')
             autotext.set_fontweight('bold')
         
-        plt.tight_layout()
+        fig.tight_layout()
         self._display_chart(fig)
     
-    def _generate_monthly_trends_chart(self):
+    def _generate_monthly_trends_chart(self, data):
         """Generate monthly trends chart"""
-        import matplotlib.pyplot as plt
-        import numpy as np
-        from datetime import datetime, timedelta
+        months = data['months']
+        current_year = np.array(data['current_year'])
+        previous_year = np.array(data['previous_year'])
         
-        # Sample data for 12 months
-        months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-        current_year = [15000, 18000, 14500, 22000, 25000, 19000, 21000, 23000, 18500, 26000, 24000, 20000]
-        previous_year = [12000, 16000, 13000, 19000, 22000, 17000, 18000, 20000, 16000, 23000, 21000, 18000]
-        
-        fig, ax = plt.subplots(figsize=(12, 6))
+        fig = self._new_chart_figure()
+        ax = fig.subplots()
         fig.suptitle('Monthly Spending Trends Comparison', fontsize=16, fontweight='bold')
         
         x = np.arange(len(months))
@@ -2003,20 +2536,18 @@ Example: "Dear {name}, your card ending in {card_last4} has..."
         p = np.poly1d(z)
         ax.plot(x, p(x), "r--", alpha=0.8, linewidth=2, label='Trend')
         
-        plt.tight_layout()
+        fig.tight_layout()
         self._display_chart(fig)
     
-    def _generate_email_statistics_chart(self):
+    def _generate_email_statistics_chart(self, data):
         """Generate email statistics chart"""
-        import matplotlib.pyplot as plt
-        
-        # Sample email stats
-        categories = ['Statements Sent', 'Reminders', 'Approvals', 'Notifications', 'Reports']
-        sent = [245, 180, 95, 320, 75]
-        opened = [220, 165, 88, 290, 68]
-        clicked = [185, 120, 76, 210, 55]
+        categories = data['categories']
+        sent = np.array(data['sent'])
+        opened = np.array(data['opened'])
+        clicked = np.array(data['clicked'])
         
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+        fig = self._new_chart_figure()
+        ax1, ax2 = fig.subplots(1, 2)
         fig.suptitle('Email Campaign Statistics', fontsize=16, fontweight='bold')
         
         # Stacked bar chart
@@ -2035,9 +2566,9 @@ Example: "Dear {name}, your card ending in {card_last4} has..."
         ax1.grid(axis='y', alpha=0.3)
         
         # Engagement rates pie chart
-        total_sent = sum(sent)
-        total_opened = sum(opened)
-        total_clicked = sum(clicked)
+        total_sent = sent.sum()
+        total_opened = opened.sum()
+        total_clicked = clicked.sum()
         
         engagement = ['Not Opened', 'Opened Only', 'Clicked']
         values = [total_sent - total_opened, total_opened - total_clicked, total_clicked]
@@ -2046,15 +2577,13 @@ Example: "Dear {name}, your card ending in {card_last4} has..."
         ax2.pie(values, labels=engagement, colors=colors, autopct='%1.1f%%', startangle=90)
         ax2.set_title('Overall Engagement Rate')
         
-        plt.tight_layout()
+        fig.tight_layout()
         self._display_chart(fig)
     
     def _generate_sample_chart(self, chart_type):
         """Generate a sample chart for unknown types"""
-        import matplotlib.pyplot as plt
-        import numpy as np
-        
-        fig, ax = plt.subplots(figsize=(10, 6))
+        fig = self._new_chart_figure()
+        ax = fig.subplots()
         
         # Generate sample data
         x = np.linspace(0, 10, 100)
@@ -2066,25 +2595,36 @@ Example: "Dear {name}, your card ending in {card_last4} has..."
         ax.set_ylabel('Y Values')
         ax.grid(alpha=0.3)
         
-        plt.tight_layout()
+        fig.tight_layout()
         self._display_chart(fig)
     
+    def _new_chart_figure(self):
+        """Return the shared chart figure, cleared for a new chart"""
+        if self.chart_figure is None:
+            from matplotlib.figure import Figure
+            self.chart_figure = Figure()
+        else:
+            self.chart_figure.clear()
+        return self.chart_figure
+    
     def _display_chart(self, fig):
         """Display chart in the UI"""
-        # Create canvas if it doesn't exist
+        # Canvas and toolbar are built once; later charts just redraw
         if self.chart_canvas:
-            self.chart_canvas.get_tk_widget().destroy()
+            # Forget the previous chart's zoom/pan history
+            self.chart_toolbar.update()
+            self.chart_canvas.draw_idle()
+            return
         
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
         self.chart_canvas = FigureCanvasTkAgg(fig, self.chart_frame)
         self.chart_canvas.draw()
         self.chart_canvas.get_tk_widget().pack(fill="both", expand=True)
         
         # Add toolbar for interactivity
-        if not hasattr(self, 'chart_toolbar'):
-            from matplotlib.backends.backend_tkagg import NavigationToolbar2Tk
-            toolbar_frame = ttk.Frame(self.chart_frame)
-            toolbar_frame.pack(fill="x")
-            self.chart_toolbar = NavigationToolbar2Tk(self.chart_canvas, toolbar_frame)
+        toolbar_frame = ttk.Frame(self.chart_frame)
+        toolbar_frame.pack(fill="x")
+        self.chart_toolbar = NavigationToolbar2Tk(self.chart_canvas, toolbar_frame)
     
     # AI methods
     def _process_ai_command(self, event=None):
@@ -2121,16 +2661,26 @@ Example: "Dear {name}, your card ending in {card_last4} has..."
         """Add message to AI chat"""
         self.ai_chat_text.config(state="normal")
         
-        timestamp = datetime.now().strftime("%H:%M:%S")
+        timestamp = time.strftime("%H:%M:%S")
         
-        # Add sender and timestamp
-        self.ai_chat_text.insert(tk.END, f"[{timestamp}] {sender}:\\n", "sender")
+        # Sender line (tagged) and message in one insert call
+        self.ai_chat_text.insert(tk.END, f"[{timestamp}] {sender}:\n", "sender", f"{message}\n\n", ())
         
-        # Add message
-        self.ai_chat_text.insert(tk.END, f"{message}\\n\\n")
+        # Drop the oldest lines past the cap
+        line_count = int(self.ai_chat_text.index("end-1c").split(".")[0])
+        if line_count > self.AI_CHAT_MAX_LINES:
+            self.ai_chat_text.delete("1.0", f"{line_count - self.AI_CHAT_MAX_LINES + 1}.0")
         
-        # Auto-scroll to bottom
-        self.ai_chat_text.see(tk.END)
         self.ai_chat_text.config(state="disabled")
+        
+        # Auto-scroll to bottom once per burst of messages
+        if not self._ai_scroll_scheduled:
+            self._ai_scroll_scheduled = True
+            self.root.after_idle(self._scroll_ai_chat)
+    
+    def _scroll_ai_chat(self):
+        """Scroll the AI chat to the newest message"""
+        self._ai_scroll_scheduled = False
+        self.ai_chat_text.see(tk.END)
 
 __all__ = ['MainWindow']
\ No newline at end of file
@@ -0,0 +1,81 @@
+"""
+Cardholder row-window tests with a fake Treeview (no display needed).
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.ui import main_window
+from src.ui.main_window import MainWindow
+
+ROW_HEIGHT = 20
+HEADING_HEIGHT = 25
+
+
+class FakeTree:
+    """Just enough of ttk.Treeview for the row window"""
+    
+    def __init__(self):
+        self.items = {}
+        self.selected = ()
+        self.idle = []
+    
+    def insert(self, parent, index, iid, values):
+        self.items[iid] = values
+    
+    def item(self, iid, values):
+        self.items[iid] = values
+    
+    def delete(self, *iids):
+        for iid in iids:
+            del self.items[iid]
+    
+    def bbox(self, iid):
+        return (0, HEADING_HEIGHT, 600, ROW_HEIGHT) if iid in self.items else ""
+    
+    def selection(self):
+        return self.selected
+    
+    def selection_set(self, items):
+        self.selected = tuple(items)
+    
+    def after_idle(self, callback):
+        self.idle.append(callback)
+    
+    def winfo_height(self):
+        return HEADING_HEIGHT + 10 * ROW_HEIGHT + 5
+
+
+@pytest.fixture
+def window(monkeypatch):
+    monkeypatch.setattr(main_window.ttk, "Style",
+                        lambda: SimpleNamespace(lookup=lambda style, option: ROW_HEIGHT))
+    win = MainWindow.__new__(MainWindow)
+    win.cardholders_tree = FakeTree()
+    win._cardholders_vscroll = SimpleNamespace(set=lambda first, last: None)
+    win._cardholder_rows = [(f"name{i}",) for i in range(30)]
+    win._cardholder_first = 0
+    win._cardholder_window = 0
+    win._cardholder_slot_values = []
+    win._cardholder_heading_height = None
+    return win
+
+
+def test_window_excludes_heading(window):
+    window._on_cardholders_resize(SimpleNamespace(height=window.cardholders_tree.winfo_height()))
+    for callback in window.cardholders_tree.idle:
+        callback()
+    
+    assert window._cardholder_window == 10
+
+
+def test_last_row_shown_when_scrolled_to_end(window):
+    window._on_cardholders_resize(SimpleNamespace(height=window.cardholders_tree.winfo_height()))
+    for callback in window.cardholders_tree.idle:
+        callback()
+    
+    window._scroll_cardholders("moveto", "1.0")
+    
+    assert window._cardholder_slot_values[-1] == ("name29",)
+    assert len(window._cardholder_slot_values) == window._cardholder_window
@@ -0,0 +1,68 @@
+"""
+Analytics chart regeneration tests; charts are drawn with Agg instead of Tk.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("matplotlib")
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from src.ui import main_window
+from src.ui.main_window import MainWindow
+
+
+@pytest.fixture
+def window():
+    win = MainWindow.__new__(MainWindow)
+    win.chart_figure = None
+    win.chart_canvas = None
+    win._chart_key = None
+    win.chart_type_var = SimpleNamespace(get=lambda: "monthly_trends")
+    win.activity = []
+    win._add_activity = win.activity.append
+    win.drawn = []
+    win._display_chart = lambda fig: (FigureCanvasAgg(fig).draw(), win.drawn.append(len(fig.axes)))
+    return win
+
+
+def test_unchanged_chart_data_skips_redraw(window):
+    window._generate_chart()
+    window._generate_chart()
+    
+    assert len(window.drawn) == 1
+
+
+def test_changed_chart_data_redraws(window, monkeypatch):
+    window._generate_chart()
+    
+    data = dict(main_window._CHART_SAMPLE_DATA["monthly_trends"])
+    data["current_year"] = tuple(value + 1 for value in data["current_year"])
+    monkeypatch.setitem(main_window._CHART_SAMPLE_DATA, "monthly_trends", data)
+    window._generate_chart()
+    
+    assert len(window.drawn) == 2
+
+
+@pytest.mark.parametrize("chart_type", [
+    "transactions_by_month", "spending_by_cardholder", "category_breakdown",
+    "monthly_trends", "email_statistics", "unknown",
+])
+def test_every_chart_type_draws(window, chart_type):
+    window.chart_type_var = SimpleNamespace(get=lambda: chart_type)
+    
+    window._generate_chart()
+    
+    assert window.drawn and window._chart_key is not None
+
+
+def test_redraw_resets_toolbar_history():
+    win = MainWindow.__new__(MainWindow)
+    calls = []
+    win.chart_canvas = SimpleNamespace(draw_idle=lambda: calls.append("draw_idle"))
+    win.chart_toolbar = SimpleNamespace(update=lambda: calls.append("update"))
+    
+    win._display_chart(None)
+    
+    assert calls == ["update", "draw_idle"]
@@ -0,0 +1,35 @@
+"""
+DatabaseManager tests against a file-backed SQLite database.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import text
+
+from src.core.database import DatabaseManager, EmailLog
+
+
+def test_sqlite_file_uses_wal(tmp_path):
+    db = DatabaseManager(f"sqlite:///{tmp_path / 'dashboard.db'}")
+    try:
+        with db.engine.connect() as connection:
+            assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+    finally:
+        db.close()
+
+
+def test_concurrent_writers_keep_every_row(tmp_path):
+    db = DatabaseManager(f"sqlite:///{tmp_path / 'dashboard.db'}")
+    
+    def write(worker):
+        for i in range(25):
+            db.log_email(recipient_email=f"user{worker}-{i}@x.com", subject="Hi")
+        
+    try:
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(write, range(4)))
+        
+        with db.get_session() as session:
+            assert session.query(EmailLog).count() == 100
+    finally:
+        db.close()
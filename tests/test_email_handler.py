@@ -0,0 +1,101 @@
+"""
+Bulk email job tests against a fake SMTP server and email log.
+"""
+
+import smtplib
+
+import pytest
+
+from src.core.config import config
+from src.modules import email_handler
+from src.modules.email_handler import EmailHandler, EmailRecipient, EmailTemplate
+
+
+class FakeDB:
+    """Records log_email calls"""
+    
+    def __init__(self):
+        self.logged = []
+    
+    def log_email(self, **fields):
+        self.logged.append(fields)
+
+
+class RejectingSMTP:
+    """SMTP server that refuses every message"""
+    
+    def __init__(self, host, port):
+        pass
+    
+    def starttls(self):
+        pass
+    
+    def login(self, username, password):
+        pass
+    
+    def send_message(self, msg, to_addrs=None):
+        raise smtplib.SMTPDataError(554, b"rejected")
+    
+    def quit(self):
+        pass
+
+
+@pytest.fixture
+def handler(monkeypatch, tmp_path):
+    monkeypatch.setattr(config.paths, "templates_dir", tmp_path)
+    monkeypatch.setattr(email_handler, "get_db_manager", lambda url: FakeDB())
+    monkeypatch.setattr(email_handler.smtplib, "SMTP", RejectingSMTP)
+    return EmailHandler(config)
+
+
+def _run(handler, count):
+    # One domain per recipient so each is its own envelope
+    recipients = [EmailRecipient(f"user{i}@domain{i}.com") for i in range(count)]
+    job_id = handler.create_bulk_job("bulk", recipients, template=EmailTemplate("bulk", "Hi", "Body"))
+    return handler.execute_bulk_job(job_id, use_outlook=False, delay_seconds=0)
+
+
+def test_small_job_tries_every_recipient(handler):
+    results = _run(handler, 2)
+    
+    assert results['status'] == "partial"
+    assert results['failed_count'] == 2
+    assert results['skipped_count'] == 0
+    assert len(handler.db_manager.logged) == 2
+
+
+def test_aborted_job_records_skipped_recipients(handler):
+    results = _run(handler, 60)
+    
+    # Aborts once failures pass max(10, 60 // 3)
+    assert results['status'] == "failed"
+    assert results['skipped_count'] == 60 - 21
+    assert results['success_count'] + results['failed_count'] == 60
+    assert len(results['results']) == 60
+    assert len(handler.db_manager.logged) == 60
+    assert sum(entry['status'] == "skipped" for entry in handler.db_manager.logged) == 60 - 21
+
+
+class SingleRecipientSMTP(RejectingSMTP):
+    """SMTP server that rejects any message with more than one recipient"""
+    
+    sent = []
+    
+    def send_message(self, msg, to_addrs=None):
+        if to_addrs is not None and len(to_addrs) > 1:
+            raise smtplib.SMTPDataError(452, b"too many recipients")
+        SingleRecipientSMTP.sent.append(msg['To'])
+        return {}
+
+
+def test_rejected_group_falls_back_to_individual_sends(handler, monkeypatch):
+    monkeypatch.setattr(email_handler.smtplib, "SMTP", SingleRecipientSMTP)
+    SingleRecipientSMTP.sent = []
+    recipients = [EmailRecipient(f"user{i}@example.com") for i in range(30)]
+    job_id = handler.create_bulk_job("bulk", recipients, template=EmailTemplate("bulk", "Hi", "Body"))
+    
+    results = handler.execute_bulk_job(job_id, use_outlook=False, delay_seconds=0)
+    
+    assert results['status'] == "completed"
+    assert results['success_count'] == 30
+    assert sorted(SingleRecipientSMTP.sent) == sorted(r.email for r in recipients)
@@ -0,0 +1,96 @@
+"""
+ExcelHandler cardholder sync tests against a file-backed SQLite database.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core.database import DatabaseManager
+from src.modules.excel_handler import ExcelHandler
+
+
+@pytest.fixture
+def handler(tmp_path):
+    db = DatabaseManager(f"sqlite:///{tmp_path / 'dashboard.db'}")
+    handler = ExcelHandler.__new__(ExcelHandler)
+    handler.db_manager = db
+    yield handler
+    db.close()
+
+
+def _cardholders(handler):
+    return {c.card_number: (c.name, c.department) for c in handler.db_manager.get_cardholders()}
+
+
+def test_sync_skips_invalid_and_duplicate_rows(handler):
+    handler.db_manager.create_cardholder(card_number="A1", name="old", email="o@x.com", department="Old")
+    df = pd.DataFrame({
+        'card_number': ["A1", "B2", "", np.nan, "B2", "X" * 51, "C3"],
+        'name': ["new", "first", "blank", "missing", "second", "long", "c"],
+        'email': ["a@x.com", "b@x.com", "e@x.com", "m@x.com", "b2@x.com", "l@x.com", "c@x.com"],
+        'department': [np.nan, "D", "E", "F", "G", "H", "I"],
+    })
+    
+    handler._sync_cardholders(df)
+    
+    assert _cardholders(handler) == {
+        "A1": ("new", "Old"),
+        "B2": ("first", "D"),
+        "C3": ("c", "I"),
+    }
+
+
+def test_sync_skips_row_that_fails_conversion(handler):
+    class Unprintable:
+        def __str__(self):
+            raise ValueError("bad value")
+    
+    df = pd.DataFrame({
+        'card_number': ["A1", "B2"],
+        'name': [Unprintable(), "b"],
+        'email': ["a@x.com", "b@x.com"],
+    })
+    
+    handler._sync_cardholders(df)
+    
+    assert list(_cardholders(handler)) == ["B2"]
+
+
+@pytest.fixture
+def cached_handler(tmp_path):
+    handler = ExcelHandler.__new__(ExcelHandler)
+    handler.cache_dir = tmp_path / "excel_cache"
+    handler.cache_max_entries = 2
+    return handler
+
+
+def _write_workbook(path):
+    pd.DataFrame({
+        'Card Number': ["A1", "B2"],
+        'Full Name': ["Alice", "Bob"],
+        'Email': ["alice@x.com", "bob@x.com"],
+    }).to_excel(path, sheet_name="OUTSTANDING LOGS", index=False)
+    return path
+
+
+def test_cache_hit_gets_fresh_timestamps(cached_handler, tmp_path):
+    path = _write_workbook(tmp_path / "cards.xlsx")
+    
+    first = cached_handler.load_cardholder_data(path)
+    second = cached_handler.load_cardholder_data(path)
+    
+    assert list(second['card_number']) == ["A1", "B2"]
+    assert second['created_at'].iloc[0] > first['created_at'].iloc[0]
+
+
+def test_cache_keeps_most_recent_entries(cached_handler, tmp_path):
+    paths = [_write_workbook(tmp_path / f"cards{i}.xlsx") for i in range(3)]
+    
+    for path in paths:
+        cached_handler.load_cardholder_data(path)
+    
+    cached = {entry.name for entry in cached_handler.cache_dir.iterdir()}
+    expected = {cached_handler._cardholder_cache_entry(path, "OUTSTANDING LOGS")[0].name
+                for path in paths[1:]}
+    assert cached == expected
@@ -0,0 +1,94 @@
+"""
+Recipient list round-trip tests: text written by the recipient producers
+must parse back in _send_bulk_email.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.ui import main_window
+from src.ui.main_window import MainWindow, _RECIPIENT_LINE_RE, _parse_recipient_lines
+
+
+class FakeText:
+    """Minimal stand-in for the recipients ScrolledText"""
+    
+    def __init__(self):
+        self.content = ""
+    
+    def delete(self, start, end):
+        self.content = ""
+    
+    def insert(self, index, text):
+        self.content = text + self.content
+    
+    def get(self, start, end):
+        return self.content + "\n"
+
+
+@pytest.fixture
+def window(monkeypatch):
+    """MainWindow without Tk; dialogs are silenced"""
+    win = MainWindow.__new__(MainWindow)
+    win.recipients_text = FakeText()
+    win._add_activity = lambda message: None
+    for name in ("showinfo", "showwarning", "showerror"):
+        monkeypatch.setattr(main_window.messagebox, name, lambda *args, **kwargs: None)
+    return win
+
+
+def _parse(text):
+    return [(match.group(1), match.group(2)) for match in _RECIPIENT_LINE_RE.finditer(text)]
+
+
+def test_cardholder_recipients_parse(window):
+    window.cardholders = [
+        SimpleNamespace(name="Alice Smith", email="alice@x.com"),
+        SimpleNamespace(name="Bob", email="bob@y.org"),
+        SimpleNamespace(name="No Email", email=""),
+    ]
+    
+    window._add_cardholders_as_recipients()
+    
+    assert _parse(window.recipients_text.get("1.0", "end")) == [
+        ("Alice Smith", "alice@x.com"),
+        ("Bob", "bob@y.org"),
+    ]
+
+
+def test_imported_recipients_parse(window, monkeypatch):
+    monkeypatch.setattr(main_window.filedialog, "askopenfilename", lambda **kwargs: "list.xlsx")
+    window._load_recipients_from_excel = lambda path: [
+        {'name': "Alice Smith", 'email': "alice@x.com"},
+        {'name': "Bob", 'email': "bob@y.org"},
+    ]
+    
+    window._import_email_recipients()
+    
+    assert _parse(window.recipients_text.get("1.0", "end")) == [
+        ("Alice Smith", "alice@x.com"),
+        ("Bob", "bob@y.org"),
+    ]
+
+
+def test_line_with_several_addresses_is_split():
+    recipients, rejected = _parse_recipient_lines("a@x.com; b@y.com\nCarol <c@z.org>, d@w.net\n")
+    
+    assert [(r.name, r.email) for r in recipients] == [
+        ("", "a@x.com"), ("", "b@y.com"), ("Carol", "c@z.org"), ("", "d@w.net"),
+    ]
+    assert rejected == []
+
+
+def test_name_with_comma_is_one_recipient():
+    recipients, rejected = _parse_recipient_lines('"Smith, John" <john@x.com>')
+    
+    assert [(r.name, r.email) for r in recipients] == [("Smith, John", "john@x.com")]
+
+
+def test_unreadable_lines_are_reported():
+    recipients, rejected = _parse_recipient_lines("a@x.com\nnot an address\nb@y.com; nope\n\n")
+    
+    assert [r.email for r in recipients] == ["a@x.com"]
+    assert rejected == ["not an address", "b@y.com; nope"]
@@ -0,0 +1,68 @@
+"""
+Running-scripts tree tests with a fake Treeview (no display needed).
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.ui import main_window
+from src.ui.main_window import MainWindow
+
+
+class FakeTree:
+    """Just enough of ttk.Treeview for the running-scripts list"""
+    
+    def __init__(self):
+        self.rows = {}
+        self.selected = ()
+    
+    def insert(self, parent, index, iid, values):
+        self.rows[iid] = dict(zip(("Script", "Status", "Runtime", "PID"), values))
+    
+    def set(self, iid, column, value):
+        self.rows[iid][column] = value
+    
+    def delete(self, *iids):
+        for iid in iids:
+            del self.rows[iid]
+    
+    def selection(self):
+        return self.selected
+
+
+def _running(execution_id, pid, runtime):
+    return {'execution_id': execution_id, 'script_name': "report", 'pid': pid,
+            'runtime_seconds': runtime, 'start_time': None}
+
+
+@pytest.fixture
+def window(monkeypatch):
+    for name in ("showinfo", "showwarning", "showerror"):
+        monkeypatch.setattr(main_window.messagebox, name, lambda *args, **kwargs: None)
+    win = MainWindow.__new__(MainWindow)
+    win.running_scripts_tree = FakeTree()
+    win._running_by_id = {}
+    win.stopped = []
+    win.script_runner = SimpleNamespace(stop_script=lambda execution_id: win.stopped.append(execution_id) or True)
+    win._add_activity = lambda message: None
+    win._append_script_output = lambda text: None
+    return win
+
+
+def test_two_runs_of_one_script_both_update(window):
+    window._update_running_scripts_tree([_running("report_1", 10, 1.0), _running("report_2", 11, 0.5)])
+    window._update_running_scripts_tree([_running("report_1", 10, 2.0), _running("report_2", 11, 1.5)])
+    
+    rows = window.running_scripts_tree.rows
+    assert rows["report_1"]["Runtime"] == "2.0s"
+    assert rows["report_2"]["Runtime"] == "1.5s"
+
+
+def test_stop_targets_the_selected_run(window):
+    window._update_running_scripts_tree([_running("report_1", 10, 1.0), _running("report_2", 11, 0.5)])
+    window.running_scripts_tree.selected = ("report_1",)
+    
+    window._stop_selected_script()
+    
+    assert window.stopped == ["report_1"]
@@ -0,0 +1,60 @@
+"""
+ScriptRunner tests running small Python child processes.
+"""
+
+import sys
+import time
+
+import pytest
+
+from src.core.config import config
+from src.core.database import DatabaseManager
+from src.modules import script_runner
+from src.modules.script_runner import ScriptInfo, ScriptRunner, ScriptStatus
+
+
+@pytest.fixture
+def runner(monkeypatch, tmp_path):
+    db = DatabaseManager(f"sqlite:///{tmp_path / 'dashboard.db'}")
+    monkeypatch.setattr(script_runner, "get_db_manager", lambda url: db)
+    runner = ScriptRunner(config)
+    yield runner
+    runner.cleanup()
+    db.close()
+
+
+def _wait(runner, execution_id, timeout=30):
+    deadline = time.monotonic() + timeout
+    while runner.get_script_status(execution_id) == ScriptStatus.RUNNING:
+        assert time.monotonic() < deadline, "script did not finish"
+        time.sleep(0.05)
+    return runner.get_script_status(execution_id)
+
+
+def test_output_is_read_without_a_callback(runner, tmp_path):
+    # Far more than a pipe buffer holds; an undrained pipe would block the child
+    script = tmp_path / "chatty.py"
+    script.write_text("for i in range(20000):\n    print('x' * 20)\n")
+    runner.register_script(ScriptInfo(name="chatty", path=str(script)))
+    
+    execution_id = runner.run_script("chatty")
+    
+    assert _wait(runner, execution_id) == ScriptStatus.SUCCESS
+    deadline = time.monotonic() + 10
+    while len(runner.get_script_output(execution_id)) < 20000 and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert len(runner.get_script_output(execution_id)) == 20000
+
+
+def test_concurrent_runs_of_one_script_are_tracked_apart(runner, tmp_path):
+    script = tmp_path / "sleepy.py"
+    script.write_text("import time\ntime.sleep(0.5)\n")
+    runner.register_script(ScriptInfo(name="sleepy", path=str(script)))
+    
+    first = runner.run_script("sleepy")
+    second = runner.run_script("sleepy")
+    
+    assert first != second
+    assert {info['execution_id'] for info in runner.get_running_scripts()} == {first, second}
+    assert _wait(runner, first) == ScriptStatus.SUCCESS
+    assert _wait(runner, second) == ScriptStatus.SUCCESS